@@ -0,0 +1,194 @@
+import os
+import sys
+import json
+import time
+import csv
+import random
+import tempfile
+import tracemalloc
+import multiprocessing
+
+import day3_NumberGuessinggame
+from day3_NumberGuessinggame import ExpenseTracker, JournalStore, SQLiteStore, ExpenseColumns, ExpenseReport, np
+
+def timed(label, count, func):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<34} {elapsed:8.3f}s  {count / elapsed:12,.0f} rows/sec")
+    return elapsed
+
+def legacy_inserts(count):
+    # What add_expense() used to do: rewrite the whole file on every add
+    expenses = []
+    for i in range(count):
+        expenses.append({"amount": 1.0 + i % 50, "category": "Food",
+                         "description": f"item {i}", "date": "2025-08-11"})
+        with open("legacy.json", "w") as f:
+            json.dump(expenses, f)
+
+def journal_inserts(count, sync):
+    tracker = ExpenseTracker(JournalStore(sync=sync))
+    for i in range(count):
+        tracker.add_expense(1.0 + i % 50, "Food", f"item {i}", quiet=True)
+    tracker.close()
+
+def bench_journal(count):
+    legacy = min(count, 1_000)
+    timed(f"full rewrite per add ({legacy:,})", legacy, lambda: legacy_inserts(legacy))
+    synced = min(count, 20_000)
+    timed(f"journal, fsync per add ({synced:,})", synced, lambda: journal_inserts(synced, True))
+    os.remove("expenses.json")
+    timed(f"journal, no fsync ({count:,})", count, lambda: journal_inserts(count, False))
+    timed("startup (snapshot + replay)", count, lambda: ExpenseTracker())
+
+def sample_expenses(count, seed=7):
+    rng = random.Random(seed)
+    categories = ["Food", "Transport", "Entertainment", "Bills", "Other"]
+    notes = ["lunch", "bus ticket", "rent", "coffee", "groceries", "movie", ""]
+    for _ in range(count):
+        yield {"amount": round(rng.uniform(1, 300), 2), "category": rng.choice(categories),
+               "description": rng.choice(notes),
+               "date": f"{rng.randint(2020, 2025)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"}
+
+def measure(build):
+    tracemalloc.start()
+    data = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return data, size
+
+def bench_memory(count):
+    # Rows as json.load would produce them: a fresh str per field, like str(date.today())
+    _, dict_bytes = measure(lambda: [json.loads(json.dumps(e)) for e in sample_expenses(count)])
+    _, column_bytes = measure(lambda: ExpenseColumns(sample_expenses(count)))
+    per_million = 1_000_000 / count / 1024 / 1024
+    print(f"list of dicts      {dict_bytes * per_million:8.1f} MB per million expenses")
+    print(f"ExpenseColumns     {column_bytes * per_million:8.1f} MB per million expenses")
+    print(f"Reduction: {dict_bytes / column_bytes:.1f}x")
+
+def write_statement(path, count, seed=11):
+    rng = random.Random(seed)
+    payees = ["STARBUCKS #1042", "UBER *TRIP", "TESCO STORES 2231", "NETFLIX.COM", "COMCAST CABLE",
+              "SHELL OIL 5531", "AMAZON MKTPLACE", "PAYROLL DEPOSIT", "CITY PARKING", "LOCAL DELI"]
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Date", "Description", "Amount", "Balance"])
+        for i in range(count):
+            amount = -round(rng.uniform(1, 300), 2) if i % 10 else round(rng.uniform(500, 3000), 2)
+            writer.writerow([f"{rng.randint(1, 12):02d}/{rng.randint(1, 28):02d}/{rng.randint(2020, 2025)}",
+                             f"{rng.choice(payees)} {rng.randint(1, 999)}", f"{amount:.2f}", "0.00"])
+
+def bench_import(count):
+    write_statement("statement.csv", count)
+    for label, store in [("journal", JournalStore(sync=False)), ("sqlite", SQLiteStore("expenses.db"))]:
+        tracker = ExpenseTracker(store)
+        start = time.perf_counter()
+        stats = tracker.import_statement("statement.csv")
+        elapsed = time.perf_counter() - start
+        print(f"import into {label:<8} {elapsed:8.3f}s  {count / elapsed:12,.0f} rows/sec  "
+              f"({stats['imported']:,} expenses)")
+        start = time.perf_counter()
+        stats = tracker.import_statement("statement.csv")
+        elapsed = time.perf_counter() - start
+        print(f"re-import {label:<10} {elapsed:8.3f}s  {count / elapsed:12,.0f} rows/sec  "
+              f"({stats['duplicates']:,} duplicates)")
+        tracker.close()
+
+def legacy_reports(expenses):
+    # Reports written the old way, as loops over a list of expense dicts
+    months, by_category = {}, {}
+    for expense in expenses:
+        months[expense["date"][:7]] = months.get(expense["date"][:7], 0) + expense["amount"]
+        by_category.setdefault(expense["category"], []).append(expense["amount"])
+    return months, {category: sorted(amounts) for category, amounts in by_category.items()}
+
+def bench_report(count):
+    expenses = list(sample_expenses(count))
+    columns = ExpenseColumns(expenses)
+    print(f"{count:,} expenses, {'NumPy' if np is not None else 'array'} backend")
+    timed("list of dicts: monthly + percentiles", count, lambda: legacy_reports(expenses))
+    
+    def all_reports():
+        report = ExpenseReport(columns)
+        report.rollup("day")
+        report.rollup("week")
+        report.rollup("month")
+        report.moving_average(30)
+        report.category_percentiles()
+        report.burn_down(5000.0, "2025-01-01", "2025-01-31")
+    timed("ExpenseReport: all reports", count, all_reports)
+    report = ExpenseReport(columns)
+    timed("  daily series", count, report.daily_series)
+    timed("  category percentiles", count, report.category_percentiles)
+
+def stress_writer(writer, adds, locking):
+    if not locking:
+        day3_NumberGuessinggame.fcntl = None
+    try:
+        # A small compaction interval makes writers rewrite the snapshot under each other
+        tracker = ExpenseTracker(JournalStore(sync=False, compact_every=100))
+        for i in range(adds):
+            if i % 10 == 9:
+                tracker.add_expenses([{"amount": 1.0, "category": "Other", "description": f"w{writer} batch {i} {k}",
+                                       "date": "2025-08-11"} for k in range(5)])
+            else:
+                tracker.add_expense(1.0, "Food", f"w{writer} add {i}", quiet=True)
+        tracker.close()
+    except (OSError, ValueError, KeyError) as e:
+        # Only expected without locks, where writers read each other's half-written files
+        print(f"  writer {writer} failed: {e!r}")
+
+def run_stress(writers, adds, locking):
+    for name in ("expenses.json", "expenses.journal", "expenses.aggregates.json"):
+        if os.path.exists(name):
+            os.remove(name)
+    procs = [multiprocessing.Process(target=stress_writer, args=(w, adds, locking)) for w in range(writers)]
+    start = time.perf_counter()
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join()
+    elapsed = time.perf_counter() - start
+    
+    expected = writers * (adds - adds // 10 + 5 * (adds // 10))
+    tracker = ExpenseTracker(JournalStore())
+    descriptions = [e["description"] for e in tracker.expenses]
+    summary = tracker.store.summary()
+    ok = (len(descriptions) == expected and len(set(descriptions)) == expected
+          and summary["count"] == expected and summary["total"] == expected)
+    label = "with locks" if locking else "without locks"
+    print(f"{label:<14} {writers} writers: {len(descriptions):,}/{expected:,} expenses kept, "
+          f"{len(set(descriptions)):,} distinct  {elapsed:6.2f}s  {'OK' if ok else 'LOST UPDATES'}")
+    return ok
+
+def bench_stress(writers, adds):
+    run_stress(writers, adds, locking=False)
+    if not run_stress(writers, adds, locking=True):
+        sys.exit(1)
+
+def main():
+    mode = sys.argv[1] if len(sys.argv) > 1 else 'journal'
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000
+    if mode == 'memory':
+        bench_memory(count)
+        return
+    if mode == 'report':
+        bench_report(count)
+        return
+    if mode == 'stress':
+        writers = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+        adds = int(sys.argv[3]) if len(sys.argv) > 3 else 500
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            bench_stress(writers, adds)
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        if mode == 'import':
+            bench_import(count)
+        else:
+            bench_journal(count)
+
+if __name__ == "__main__":
+    main()
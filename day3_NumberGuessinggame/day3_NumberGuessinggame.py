@@ -1,16 +1,1002 @@
 # Simple Personal Expense Tracker
 # A beginner-friendly Python project demonstrating core concepts
 
+import os
+import re
+import sys
+import csv
 import json
+import heapq
+import sqlite3
 import datetime
+import itertools
+import contextlib
+from array import array
+from collections.abc import Sequence
 
-class ExpenseTracker:
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # Windows: no advisory locks, one process at a time
+
+SNAPSHOT_FILE = "expenses.json"
+JOURNAL_FILE = "expenses.journal"
+COMPACT_EVERY = 10000
+SQLITE_FILE = "expenses.db"
+SQLITE_BATCH = 50000
+IMPORT_BATCH = 50000
+DATE_FORMATS = ("%Y-%m-%d", "%m/%d/%Y", "%d/%m/%Y", "%d.%m.%Y", "%Y%m%d")
+
+# Keyword rules for bank statement descriptions; the first match in the text wins,
+# and on a tie the earlier category does
+CATEGORY_RULES = [
+    ("Food", r"grocer|supermarket|restaurant|cafe|coffee|starbucks|mcdonald|pizza|bakery|"
+             r"burger|sushi|\bdeli\b|tesco|aldi|lidl|walmart|whole ?foods|kroger|doordash|uber ?eats"),
+    ("Transport", r"uber|lyft|taxi|metro|transit|railway|\btrain|bus\b|airline|parking|fuel|"
+                  r"gas station|shell|chevron|exxon|\bbp\b"),
+    ("Entertainment", r"netflix|spotify|hulu|disney|cinema|movie|theat(?:er|re)|\bsteam\b|playstation|"
+                      r"xbox|concert|ticketmaster"),
+    ("Bills", r"electric|utility|water|internet|broadband|phone|mobile|insurance|\brent\b|mortgage|"
+              r"verizon|comcast|at&t"),
+]
+
+# Header names used by common bank exports
+STATEMENT_COLUMNS = {
+    "date": ("date", "transaction date", "posted date", "posting date", "booking date", "value date"),
+    "amount": ("amount", "transaction amount"),
+    "debit": ("debit", "withdrawal", "withdrawals", "money out", "paid out"),
+    "description": ("description", "payee", "name", "details", "memo", "narrative", "merchant"),
+    "category": ("category",),
+}
+
+AMOUNT_PERCENTILES = {"p25": 25, "median": 50, "p75": 75, "p90": 90, "p99": 99}
+
+class ExpenseAggregates:
+    """Running totals updated on every add, so summaries never rescan the expenses"""
+    
+    GROUPS = ("category", "day", "month")
+    
     def __init__(self):
-        self.expenses = []
+        # Each bucket is [total, count, min, max]
+        self.overall = [0, 0, None, None]
+        self.category = {}
+        self.day = {}
+        self.month = {}
+    
+    def add(self, expense):
+        amount = expense["amount"]
+        _bump(self.overall, amount)
+        _bump(_bucket(self.category, expense["category"]), amount)
+        _bump(_bucket(self.day, expense["date"]), amount)
+        _bump(_bucket(self.month, expense["date"][:7]), amount)
+    
+    def add_many(self, expenses):
+        overall, category, day, month = self.overall, self.category, self.day, self.month
+        for expense in expenses:
+            amount = expense["amount"]
+            date = expense["date"]
+            _bump(overall, amount)
+            _bump(category.get(expense["category"]) or _bucket(category, expense["category"]), amount)
+            _bump(day.get(date) or _bucket(day, date), amount)
+            _bump(month.get(date[:7]) or _bucket(month, date[:7]), amount)
+    
+    @classmethod
+    def rebuild(cls, expenses):
+        aggregates = cls()
+        aggregates.add_many(expenses)
+        return aggregates
+    
+    def summary(self):
+        total, count, low, high = self.overall
+        return {"total": total, "count": count, "min": low, "max": high}
+    
+    def totals(self, group):
+        return {key: bucket[0] for key, bucket in getattr(self, group).items()}
+    
+    def to_dict(self):
+        data = {"overall": self.overall}
+        data.update((group, getattr(self, group)) for group in self.GROUPS)
+        return data
+    
+    @classmethod
+    def from_dict(cls, data):
+        aggregates = cls()
+        aggregates.overall = data["overall"]
+        for group in cls.GROUPS:
+            setattr(aggregates, group, data[group])
+        return aggregates
+
+def _bucket(group, key):
+    bucket = group.get(key)
+    if bucket is None:
+        bucket = group[key] = [0, 0, None, None]
+    return bucket
+
+def _bump(bucket, amount):
+    bucket[0] += amount
+    bucket[1] += 1
+    if bucket[2] is None or amount < bucket[2]:
+        bucket[2] = amount
+    if bucket[3] is None or amount > bucket[3]:
+        bucket[3] = amount
+
+class ExpenseColumns(Sequence):
+    """Compact column storage for expenses that still reads like a list of dicts
+    
+    Amounts live in array('d'), dates as int32 day ordinals, categories as small
+    int codes and descriptions as indexes into a pool of unique strings. Dicts
+    are only built when an item is read, so editing one does not change the store.
+    """
+    
+    def __init__(self, expenses=()):
+        self.amounts = array("d")
+        self.days = array("i")
+        self.category_codes = array("H")
+        self.description_ids = array("I")
+        self.categories = []
+        self.descriptions = []
+        self._category_index = {}
+        self._description_index = {}
+        self._ordinals = {}
+        self.extend(expenses)
+    
+    def append(self, expense):
+        self.amounts.append(expense["amount"])
+        self.days.append(self._ordinal(expense["date"]))
+        self.category_codes.append(_intern(expense["category"], self.categories, self._category_index))
+        self.description_ids.append(_intern(expense.get("description", ""), self.descriptions,
+                                            self._description_index))
+    
+    def extend(self, expenses):
+        amounts, days, codes, desc_ids = self.amounts, self.days, self.category_codes, self.description_ids
+        ordinals, category_index, description_index = self._ordinals, self._category_index, self._description_index
+        for expense in expenses:
+            date, category, description = expense["date"], expense["category"], expense.get("description", "")
+            amounts.append(expense["amount"])
+            day = ordinals.get(date)
+            days.append(self._ordinal(date) if day is None else day)
+            code = category_index.get(category)
+            codes.append(_intern(category, self.categories, category_index) if code is None else code)
+            desc = description_index.get(description)
+            desc_ids.append(_intern(description, self.descriptions, description_index) if desc is None else desc)
+    
+    def _ordinal(self, date):
+        ordinal = self._ordinals.get(date)
+        if ordinal is None:
+            ordinal = self._ordinals[date] = datetime.date.fromisoformat(date).toordinal()
+        return ordinal
+    
+    def __len__(self):
+        return len(self.amounts)
+    
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        return {
+            "amount": self.amounts[i],
+            "category": self.categories[self.category_codes[i]],
+            "description": self.descriptions[self.description_ids[i]],
+            "date": _iso_date(self.days[i])
+        }
+    
+    def __iter__(self):
+        categories, descriptions = self.categories, self.descriptions
+        for amount, day, code, desc in zip(self.amounts, self.days, self.category_codes, self.description_ids):
+            yield {"amount": amount, "category": categories[code],
+                   "description": descriptions[desc], "date": _iso_date(day)}
+    
+    def indexes_between(self, start, end):
+        """Row numbers dated from start to end inclusive (ISO date strings)"""
+        lo = datetime.date.fromisoformat(start).toordinal()
+        hi = datetime.date.fromisoformat(end).toordinal()
+        return [i for i, day in enumerate(self.days) if lo <= day <= hi]
+    
+    def keys(self):
+        """(date, amount, description) for every row, used to spot duplicate imports"""
+        descriptions = self.descriptions
+        for day, amount, desc in zip(self.days, self.amounts, self.description_ids):
+            yield _iso_date(day), amount, descriptions[desc]
+    
+    def write_json(self, f, batch=10000):
+        """Write as a JSON list of dicts without materializing all of them"""
+        f.write("[")
+        for start in range(0, len(self), batch):
+            if start:
+                f.write(", ")
+            f.write(json.dumps(self[start:start + batch])[1:-1])
+        f.write("]")
+
+def _intern(value, values, index):
+    code = index.get(value)
+    if code is None:
+        code = index[value] = len(values)
+        values.append(value)
+    return code
+
+_iso_dates = {}
+
+def _iso_date(ordinal):
+    date = _iso_dates.get(ordinal)
+    if date is None:
+        date = _iso_dates[ordinal] = datetime.date.fromordinal(ordinal).isoformat()
+    return date
+
+class ExpenseReport:
+    """Rollups, moving averages, percentiles and budget burn-down over ExpenseColumns
+    
+    Everything is computed from the column arrays. With NumPy they are viewed
+    without copying and each report is a bincount, cumsum or sort; otherwise a
+    single loop over the arrays fills a per-day array('d'). Every time series
+    covers each calendar day from the first expense to the last, zeros included.
+    """
+    
+    def __init__(self, columns):
+        self.columns = columns
+        self._daily = None
+        self._daily_size = -1
+    
+    def daily_series(self):
+        """(first day ordinal, totals) where totals[i] is the spending on day first + i"""
+        columns = self.columns
+        if self._daily_size != len(columns):
+            if not len(columns):
+                self._daily = (0, array("d"))
+            elif np is not None:
+                days = np.frombuffer(columns.days, dtype=np.int32)
+                first = int(days.min())
+                totals = np.bincount(days - first, weights=np.frombuffer(columns.amounts))
+                self._daily = (first, totals)
+            else:
+                first = min(columns.days)
+                totals = [0.0] * (max(columns.days) - first + 1)
+                for day, amount in zip(columns.days, columns.amounts):
+                    totals[day - first] += amount
+                self._daily = (first, array("d", totals))
+            self._daily_size = len(columns)
+        return self._daily
+    
+    def rollup(self, period="day"):
+        """Totals per day (YYYY-MM-DD), week (YYYY-Www, ISO weeks) or month (YYYY-MM)"""
+        first, totals = self.daily_series()
+        key = _PERIOD_KEYS[period]
+        result = {}
+        for ordinal, total in enumerate(totals.tolist(), first):
+            k = key(ordinal)
+            result[k] = result.get(k, 0) + total
+        return result
+    
+    def moving_average(self, window=7):
+        """Trailing window-day average spending, for each day with a full window behind it"""
+        first, totals = self.daily_series()
+        if len(totals) < window:
+            return {}
+        if np is not None:
+            sums = np.cumsum(np.concatenate(([0.0], totals)))
+            averages = ((sums[window:] - sums[:-window]) / window).tolist()
+        else:
+            sums = list(itertools.accumulate(totals, initial=0.0))
+            averages = [(high - low) / window for low, high in zip(sums, sums[window:])]
+        return {_iso_date(ordinal): average for ordinal, average in enumerate(averages, first + window - 1)}
+    
+    def category_percentiles(self):
+        """count, min, max and nearest-rank AMOUNT_PERCENTILES of single expenses per category"""
+        columns = self.columns
+        if np is not None:
+            codes = np.frombuffer(columns.category_codes, dtype=np.uint16)
+            amounts = np.frombuffer(columns.amounts)
+            # A stable sort of 16-bit codes is a radix sort; each group then only needs partitioning
+            grouped = amounts[np.argsort(codes, kind="stable")]
+            counts = np.bincount(codes, minlength=len(columns.categories)).tolist()
+        else:
+            groups = [array("d") for _ in columns.categories]
+            appends = [group.append for group in groups]
+            for code, amount in zip(columns.category_codes, columns.amounts):
+                appends[code](amount)
+            counts = [len(group) for group in groups]
+        
+        result, start = {}, 0
+        for code, (category, count) in enumerate(zip(columns.categories, counts)):
+            if not count:
+                continue
+            ranks = {name: max(-(-count * q // 100), 1) - 1 for name, q in AMOUNT_PERCENTILES.items()}
+            ranks["min"], ranks["max"] = 0, count - 1
+            if np is not None:
+                group = np.partition(grouped[start:start + count], sorted(set(ranks.values())))
+                start += count
+            else:
+                group = sorted(groups[code])
+            stats = {"count": count}
+            stats.update((name, float(group[rank])) for name, rank in ranks.items())
+            result[category] = stats
+        return result
+    
+    def burn_down(self, budget, start, end):
+        """Per-day budget left versus an even spend-down from start to end (ISO dates)"""
+        first, totals = self.daily_series()
+        lo = datetime.date.fromisoformat(start).toordinal()
+        hi = datetime.date.fromisoformat(end).toordinal()
+        span = hi - lo + 1
+        # Days before the first or after the last expense spent nothing
+        window = [0.0] * max(0, min(first, hi + 1) - lo)
+        window += totals[max(lo - first, 0):max(hi - first + 1, 0)].tolist()
+        window += [0.0] * (span - len(window))
+        
+        rows, spent = [], 0.0
+        for i, total in enumerate(window):
+            spent += total
+            rows.append({"date": _iso_date(lo + i), "spent": spent, "remaining": budget - spent,
+                         "ideal": budget * (1 - (i + 1) / span)})
+        return rows
+
+def _week_key(ordinal):
+    year, week, _ = datetime.date.fromordinal(ordinal).isocalendar()
+    return f"{year}-W{week:02d}"
+
+_PERIOD_KEYS = {
+    "day": _iso_date,
+    "week": _week_key,
+    "month": lambda ordinal: _iso_date(ordinal)[:7],
+}
+
+class JournalStore:
+    """Expenses kept as a JSON snapshot plus an append-only journal of newer entries
+    
+    Several processes can share the files. Each one remembers the version it has
+    seen (which snapshot file, and how far into the journal it has read). Writes
+    take an exclusive fcntl lock, replay anything newer from the other writers and
+    only then append, so an entry's seq is always the next free one and no update
+    is lost. Reads take a shared lock and catch up the same way.
+    """
+    
+    def __init__(self, snapshot=SNAPSHOT_FILE, journal=JOURNAL_FILE,
+                 compact_every=COMPACT_EVERY, sync=True):
+        self.snapshot = snapshot
+        self.journal = journal
+        self.aggregates_file = os.path.splitext(snapshot)[0] + ".aggregates.json"
+        self.lock_file = os.path.splitext(snapshot)[0] + ".lock"
+        self.compact_every = compact_every
+        self.sync = sync
+        self.expenses = ExpenseColumns()
+        self.aggregates = ExpenseAggregates()
+        self.pending = 0
+        self.deferred = False
+        self._journal_file = None
+        self._journal_offset = 0
+        self._snapshot_id = None
+        self._lock_fd = None
+        self._lock_depth = 0
+    
+    @contextlib.contextmanager
+    def _locked(self, exclusive):
+        """Hold the store's file lock; nested calls reuse the outer lock"""
+        if fcntl is None or self._lock_depth:
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+            return
+        if self._lock_fd is None:
+            self._lock_fd = os.open(self.lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+        fcntl.flock(self._lock_fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        self._lock_depth = 1
+        try:
+            yield
+        finally:
+            self._lock_depth = 0
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+    
+    def load(self):
+        """Read the snapshot, then replay journal entries newer than it"""
+        with self._locked(exclusive=False):
+            self._load()
+        return self.expenses
+    
+    def _load(self):
+        self._snapshot_id = _file_id(self.snapshot)
+        try:
+            with open(self.snapshot, "r") as f:
+                expenses = json.load(f)
+        except FileNotFoundError:
+            expenses = []
+        self.aggregates = self._load_aggregates(expenses)
+        self.expenses = ExpenseColumns(expenses)
+        self.pending = 0
+        self._journal_offset = 0
+        self._replay()
+    
+    def _replay(self, repair=False):
+        """Apply journal entries from _journal_offset on; with repair, cut off a torn tail"""
+        try:
+            with open(self.journal, "rb") as f:
+                f.seek(self._journal_offset)
+                for line in f:
+                    try:
+                        if not line.endswith(b"\n"):
+                            raise ValueError("unterminated entry")
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Torn write from a crash, nothing after it was acknowledged
+                        if repair:
+                            os.truncate(self.journal, self._journal_offset)
+                        break
+                    # Entries at or below the snapshot size are already in it (crash mid-compaction)
+                    if entry["seq"] == len(self.expenses):
+                        batch = entry["expenses"] if "expenses" in entry else [entry["expense"]]
+                        self.expenses.extend(batch)
+                        self.aggregates.add_many(batch)
+                        self.pending += len(batch)
+                    self._journal_offset += len(line)
+        except FileNotFoundError:
+            pass
+    
+    def _catch_up(self, repair=False):
+        """Bring memory up to the version on disk; call with the lock held"""
+        try:
+            journal_size = os.path.getsize(self.journal)
+        except FileNotFoundError:
+            journal_size = 0
+        if _file_id(self.snapshot) != self._snapshot_id or journal_size < self._journal_offset:
+            self._load()  # another process compacted
+        elif journal_size > self._journal_offset:
+            self._replay(repair)
+    
+    def refresh(self):
+        """Pick up expenses added by other processes since the last read or write"""
+        with self._locked(exclusive=False):
+            self._catch_up()
+    
+    def _load_aggregates(self, expenses):
+        """Use the saved aggregates if they match the snapshot, otherwise rebuild them"""
+        try:
+            with open(self.aggregates_file, "r") as f:
+                data = json.load(f)
+            if data.get("count") == len(expenses):
+                return ExpenseAggregates.from_dict(data)
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            pass
+        return ExpenseAggregates.rebuild(expenses)
+    
+    def add(self, expense):
+        """Append one expense to the list and the journal"""
+        with self._locked(exclusive=True):
+            self._catch_up(repair=True)
+            entry = {"seq": len(self.expenses), "expense": expense}
+            self.expenses.append(expense)
+            self.aggregates.add(expense)
+            self._write_entry(entry, 1)
+            if self.needs_compaction():
+                self.compact()
+    
+    def add_many(self, expenses):
+        """Append many expenses as one journal entry, so the batch is replayed all or nothing"""
+        expenses = list(expenses)
+        if not expenses:
+            return
+        with self._locked(exclusive=True):
+            self._catch_up(repair=True)
+            entry = {"seq": len(self.expenses), "expenses": expenses}
+            self.expenses.extend(expenses)
+            self.aggregates.add_many(expenses)
+            self._write_entry(entry, len(expenses))
+            if not self.deferred and self.needs_compaction():
+                self.compact()
+    
+    def _write_entry(self, entry, count):
+        line = (json.dumps(entry) + "\n").encode()
+        if self._journal_file is None:
+            self._journal_file = open(self.journal, "ab")
+        self._journal_file.write(line)
+        self._journal_file.flush()
+        if self.sync:
+            os.fsync(self._journal_file.fileno())
+        self._journal_offset += len(line)
+        self.pending += count
+    
+    @contextlib.contextmanager
+    def bulk(self):
+        """Hold off compaction while a bulk load appends batch after batch"""
+        self.deferred = True
+        try:
+            yield self
+        finally:
+            self.deferred = False
+            if self.needs_compaction():
+                self.compact()
+    
+    def needs_compaction(self):
+        """Compact once the journal is as long as the snapshot, so rewrites stay amortized O(1) per add"""
+        return self.pending >= max(self.compact_every, len(self.expenses) - self.pending)
+    
+    def compact(self):
+        """Atomically replace the snapshot with all expenses and empty the journal"""
+        with self._locked(exclusive=True):
+            self._catch_up(repair=True)
+            _atomic_write(self.snapshot, self.expenses.write_json)
+            data = self.aggregates.to_dict()
+            data["count"] = len(self.expenses)
+            _atomic_write(self.aggregates_file, lambda f: json.dump(data, f))
+            
+            if self._journal_file is not None:
+                self._journal_file.close()
+                self._journal_file = None
+            open(self.journal, "w").close()
+            self._snapshot_id = _file_id(self.snapshot)
+            self._journal_offset = 0
+            self.pending = 0
+    
+    def save(self):
+        self.compact()
+    
+    def close(self):
+        if self.pending:
+            self.compact()
+        if self._journal_file is not None:
+            self._journal_file.close()
+            self._journal_file = None
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+    
+    def total(self):
+        self.refresh()
+        return self.aggregates.overall[0]
+    
+    def summary(self):
+        self.refresh()
+        return self.aggregates.summary()
+    
+    def category_totals(self):
+        self.refresh()
+        return self.aggregates.totals("category")
+    
+    def day_totals(self):
+        self.refresh()
+        return dict(sorted(self.aggregates.totals("day").items()))
+    
+    def month_totals(self):
+        self.refresh()
+        return dict(sorted(self.aggregates.totals("month").items()))
+    
+    def between(self, start, end):
+        """Expenses dated from start to end inclusive (ISO date strings)"""
+        self.refresh()
+        return [self.expenses[i] for i in self.expenses.indexes_between(start, end)]
+    
+    def top(self, n=10):
+        self.refresh()
+        amounts = self.expenses.amounts
+        return [self.expenses[i] for i in heapq.nlargest(n, range(len(amounts)), key=amounts.__getitem__)]
+
+class SQLiteStore:
+    """Expenses in an indexed SQLite table; reports run as SQL, not Python loops"""
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS expenses (
+            id INTEGER PRIMARY KEY,
+            amount REAL NOT NULL,
+            category TEXT NOT NULL,
+            description TEXT NOT NULL DEFAULT '',
+            date TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_expenses_date ON expenses(date, amount);
+        CREATE INDEX IF NOT EXISTS idx_expenses_category ON expenses(category, amount);
+        CREATE INDEX IF NOT EXISTS idx_expenses_month ON expenses(substr(date, 1, 7), amount);
+        CREATE INDEX IF NOT EXISTS idx_expenses_amount ON expenses(amount);
+        CREATE TABLE IF NOT EXISTS expense_totals (
+            kind TEXT NOT NULL,
+            key TEXT NOT NULL,
+            total REAL NOT NULL,
+            count INTEGER NOT NULL,
+            min REAL,
+            max REAL,
+            PRIMARY KEY (kind, key)
+        ) WITHOUT ROWID;
+    """
+    # Keeps expense_totals in step with every insert, inside the same transaction
+    TRIGGER = """
+        CREATE TRIGGER IF NOT EXISTS expenses_totals_insert AFTER INSERT ON expenses
+        BEGIN
+            INSERT INTO expense_totals (kind, key, total, count, min, max)
+            VALUES ('all', '', NEW.amount, 1, NEW.amount, NEW.amount),
+                   ('category', NEW.category, NEW.amount, 1, NEW.amount, NEW.amount),
+                   ('day', NEW.date, NEW.amount, 1, NEW.amount, NEW.amount),
+                   ('month', substr(NEW.date, 1, 7), NEW.amount, 1, NEW.amount, NEW.amount)
+            ON CONFLICT (kind, key) DO UPDATE SET
+                total = total + excluded.total, count = count + 1,
+                min = MIN(min, excluded.min), max = MAX(max, excluded.max);
+        END;
+    """
+    # Folds rows with id > ? into expense_totals with one grouped pass instead of per-row trigger work
+    ADD_TOTALS = """
+        INSERT INTO expense_totals (kind, key, total, count, min, max)
+        SELECT * FROM (
+            SELECT 'all', '', SUM(amount), COUNT(*), MIN(amount), MAX(amount) FROM expenses
+                WHERE id > :after HAVING COUNT(*)
+            UNION ALL SELECT 'category', category, SUM(amount), COUNT(*), MIN(amount), MAX(amount)
+                FROM expenses WHERE id > :after GROUP BY category
+            UNION ALL SELECT 'day', date, SUM(amount), COUNT(*), MIN(amount), MAX(amount)
+                FROM expenses WHERE id > :after GROUP BY date
+            UNION ALL SELECT 'month', substr(date, 1, 7), SUM(amount), COUNT(*), MIN(amount), MAX(amount)
+                FROM expenses WHERE id > :after GROUP BY substr(date, 1, 7)
+        ) WHERE true
+        ON CONFLICT (kind, key) DO UPDATE SET
+            total = total + excluded.total, count = count + excluded.count,
+            min = MIN(min, excluded.min), max = MAX(max, excluded.max);
+    """
+    REBUILD = """
+        DELETE FROM expense_totals;
+        INSERT INTO expense_totals
+            SELECT 'all', '', SUM(amount), COUNT(*), MIN(amount), MAX(amount) FROM expenses HAVING COUNT(*)
+            UNION ALL SELECT 'category', category, SUM(amount), COUNT(*), MIN(amount), MAX(amount)
+                FROM expenses GROUP BY category
+            UNION ALL SELECT 'day', date, SUM(amount), COUNT(*), MIN(amount), MAX(amount)
+                FROM expenses GROUP BY date
+            UNION ALL SELECT 'month', substr(date, 1, 7), SUM(amount), COUNT(*), MIN(amount), MAX(amount)
+                FROM expenses GROUP BY substr(date, 1, 7);
+    """
+    COLUMNS = "amount, category, description, date"
+    INDEXES = ("idx_expenses_date", "idx_expenses_category", "idx_expenses_month", "idx_expenses_amount")
+    
+    def __init__(self, path=SQLITE_FILE, batch_size=SQLITE_BATCH):
+        self.path = path
+        self.batch_size = batch_size
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+        self._ensure_totals()
+        self.expenses = SQLiteExpenses(self)
+        self.pending = 0
+        self.bulk_rows = None
+        self.indexes_dropped = False
+    
+    def _ensure_totals(self):
+        """Install the totals trigger, rebuilding totals for databases created without it"""
+        exists = self.conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'trigger' "
+                                   "AND name = 'expenses_totals_insert'").fetchone()
+        if not exists:
+            self.conn.executescript("BEGIN;" + self.TRIGGER + self.REBUILD + "COMMIT;")
+    
+    def load(self):
+        """Rows stay in the database; expenses is a lazy read-only view"""
+        return self.expenses
+    
+    def add(self, expense):
+        with self.conn:
+            self.conn.execute(f"INSERT INTO expenses ({self.COLUMNS}) VALUES (?, ?, ?, ?)",
+                              _expense_row(expense))
+    
+    def add_many(self, expenses):
+        """Insert in transactions of batch_size rows
+        
+        Each transaction drops the totals trigger, inserts the batch, folds it into
+        expense_totals with one grouped query and puts the trigger back, so other
+        connections never see the trigger missing and a failed batch rolls back
+        with the trigger in place.
+        """
+        rows = map(_expense_row, expenses)
+        while True:
+            batch = list(itertools.islice(rows, self.batch_size))
+            if not batch:
+                break
+            with self.conn:
+                # sqlite3 only opens a transaction by itself before INSERT/UPDATE/DELETE,
+                # so begin one here to cover the DROP TRIGGER as well
+                self.conn.execute("BEGIN")
+                self.conn.execute("DROP TRIGGER IF EXISTS expenses_totals_insert")
+                after = self.conn.execute("SELECT IFNULL(MAX(id), 0) FROM expenses").fetchone()[0]
+                # Random-order index inserts cost far more than one sorted rebuild once a
+                # bulk load reaches a fifth of the table, so drop the indexes until it ends
+                if self.bulk_rows is not None and not self.indexes_dropped and self.bulk_rows * 5 >= after:
+                    for name in self.INDEXES:
+                        self.conn.execute(f"DROP INDEX IF EXISTS {name}")
+                    self.indexes_dropped = True
+                self.conn.executemany(f"INSERT INTO expenses ({self.COLUMNS}) VALUES (?, ?, ?, ?)", batch)
+                self.conn.execute(self.ADD_TOTALS, {"after": after})
+                self.conn.execute(self.TRIGGER)
+            if self.bulk_rows is not None:
+                self.bulk_rows += len(batch)
+    
+    @contextlib.contextmanager
+    def bulk(self):
+        """Let add_many drop the secondary indexes during a large load and rebuild them after"""
+        self.bulk_rows = 0
+        try:
+            yield self
+        finally:
+            self.bulk_rows = None
+            if self.indexes_dropped:
+                self.conn.executescript(self.SCHEMA)
+                self.indexes_dropped = False
+    
+    def refresh(self):
+        """Nothing to do: every query already sees rows committed by other connections"""
+    
+    def save(self):
+        self.conn.commit()
+    
+    def close(self):
+        self.conn.close()
+    
+    def total(self):
+        return self.summary()["total"]
+    
+    def summary(self):
+        row = self.conn.execute("SELECT total, count, min, max FROM expense_totals "
+                                "WHERE kind = 'all'").fetchone()
+        if row is None:
+            return {"total": 0, "count": 0, "min": None, "max": None}
+        return dict(row)
+    
+    def _totals(self, kind):
+        rows = self.conn.execute("SELECT key, total FROM expense_totals WHERE kind = ? ORDER BY key", (kind,))
+        return dict(rows.fetchall())
+    
+    def category_totals(self):
+        return self._totals("category")
+    
+    def day_totals(self):
+        return self._totals("day")
+    
+    def month_totals(self):
+        return self._totals("month")
+    
+    def between(self, start, end):
+        """Expenses dated from start to end inclusive (ISO date strings)"""
+        rows = self.conn.execute(f"SELECT {self.COLUMNS} FROM expenses WHERE date BETWEEN ? AND ? "
+                                 "ORDER BY date, id", (start, end))
+        return [dict(row) for row in rows]
+    
+    def top(self, n=10):
+        rows = self.conn.execute(f"SELECT {self.COLUMNS} FROM expenses ORDER BY amount DESC LIMIT ?", (n,))
+        return [dict(row) for row in rows]
+
+class SQLiteExpenses:
+    """Read-only list-like view of the rows in a SQLiteStore"""
+    
+    def __init__(self, store):
+        self.store = store
+    
+    def __len__(self):
+        return self.store.conn.execute("SELECT COUNT(*) FROM expenses").fetchone()[0]
+    
+    def __iter__(self):
+        rows = self.store.conn.execute(f"SELECT {self.store.COLUMNS} FROM expenses ORDER BY id")
+        return (dict(row) for row in rows)
+    
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        row = self.store.conn.execute(f"SELECT {self.store.COLUMNS} FROM expenses ORDER BY id "
+                                      "LIMIT 1 OFFSET ?", (i,)).fetchone()
+        if row is None:
+            raise IndexError("expense index out of range")
+        return dict(row)
+    
+    def keys(self):
+        """(date, amount, description) for every row, used to spot duplicate imports"""
+        return self.store.conn.execute("SELECT date, amount, description FROM expenses")
+
+def _expense_row(expense):
+    return (expense["amount"], expense["category"], expense.get("description", ""), expense["date"])
+
+class CategoryRules:
+    """Keyword/regex rules compiled into one pattern; the matching group names the category"""
+    
+    def __init__(self, rules=CATEGORY_RULES, default="Other"):
+        self.categories = [category for category, _ in rules]
+        self.default = default
+        pattern = "|".join(f"(?P<r{i}>{rule})" for i, (_, rule) in enumerate(rules))
+        self.pattern = re.compile(pattern, re.IGNORECASE) if rules else None
+        self._cache = {}
+    
+    def categorize(self, description):
+        category = self._cache.get(description)
+        if category is None:
+            match = self.pattern.search(description) if self.pattern else None
+            category = self.categories[int(match.lastgroup[1:])] if match else self.default
+            if len(self._cache) < 100000:
+                self._cache[description] = category
+        return category
+
+def read_statement(path, date_format=None, expense_sign=-1, stats=None):
+    """Stream (date, amount, description, category) for each expense in a CSV or OFX export
+    
+    Bank exports show money going out as negative amounts, so by default only rows
+    with expense_sign are kept and their amount is made positive. Use expense_sign=1
+    for card statements that list purchases as positive. category is None unless
+    the file has a category column. Rows whose amount or date can't be read, like a
+    "Pending" row or a footer, are left out and counted in stats["skipped"].
+    """
+    if stats is None:
+        stats = {}
+    stats.setdefault("skipped", 0)
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        if path.lower().endswith((".ofx", ".qfx")):
+            rows = _ofx_rows(f)
+        else:
+            rows = _csv_rows(f)
+        yield from _with_dates(_expense_rows(rows, expense_sign, stats), date_format, stats)
+
+def _expense_rows(rows, expense_sign, stats):
+    for date, amount, description, category in rows:
+        if not amount or not date:
+            continue
+        value = _parse_amount(amount)
+        if value is None:
+            stats["skipped"] += 1
+            continue
+        if expense_sign is not None:
+            if value * expense_sign <= 0:
+                continue
+            value = abs(value)
+        yield date, value, description, category
+
+def _csv_rows(f):
+    reader = csv.reader(f)
+    header = next(reader, None)
+    if header is None:
+        return
+    names = [name.strip().lower() for name in header]
+    columns = {}
+    for field, aliases in STATEMENT_COLUMNS.items():
+        for i, name in enumerate(names):
+            if name in aliases:
+                columns[field] = i
+                break
+    if "date" not in columns or ("amount" not in columns and "debit" not in columns):
+        raise ValueError(f"Unrecognized statement header: {header}")
+    date_col = columns["date"]
+    desc_col = columns.get("description")
+    cat_col = columns.get("category")
+    if "amount" in columns:
+        amount_col, negate = columns["amount"], False
+    else:
+        # Debit columns hold money out as a positive number
+        amount_col, negate = columns["debit"], True
+    width = max(columns.values()) + 1
+    for row in reader:
+        if len(row) < width:
+            continue
+        amount = row[amount_col].strip()
+        if negate and amount:
+            amount = "-" + amount
+        yield (row[date_col].strip(), amount,
+               row[desc_col].strip() if desc_col is not None else "",
+               row[cat_col].strip() or None if cat_col is not None else None)
+
+OFX_FIELD = re.compile(r"<(DTPOSTED|TRNAMT|NAME|MEMO)>([^<\r\n]*)", re.IGNORECASE)
+
+def _ofx_rows(f):
+    # OFX 1.x is SGML without closing tags, so read it line by line per <STMTTRN> block
+    fields = None
+    for line in f:
+        upper = line.upper()
+        if "<STMTTRN>" in upper:
+            fields = {}
+        if fields is not None:
+            for tag, value in OFX_FIELD.findall(line):
+                fields[tag.upper()] = value.strip()
+            if "</STMTTRN>" in upper:
+                yield (fields.get("DTPOSTED", "")[:8], fields.get("TRNAMT", ""),
+                       fields.get("NAME") or fields.get("MEMO", ""), None)
+                fields = None
+
+def _parse_amount(text):
+    try:
+        return float(text)
+    except ValueError:
+        pass
+    cleaned = text.replace(",", "").replace("$", "").replace("\u20ac", "").replace("\u00a3", "").strip()
+    if cleaned.startswith("(") and cleaned.endswith(")"):
+        cleaned = "-" + cleaned[1:-1]
+    elif cleaned.startswith("--"):
+        cleaned = cleaned[2:]
+    try:
+        return float(cleaned)
+    except ValueError:
+        return None
+
+def _parse_date(text, fmt):
+    try:
+        return datetime.datetime.strptime(text, fmt).date().isoformat()
+    except ValueError:
+        return None
+
+def _with_dates(rows, date_format, stats):
+    """Turn each row's date text into an ISO date, reading the whole file with one format
+    
+    03/04/2024 fits both month-first and day-first formats, so rows are held back
+    until a date that only one of the remaining formats can read settles it. If no
+    date ever does, the first remaining format in DATE_FORMATS is used. Rows with a
+    date the format can't read are skipped, so one bad row doesn't stop an import
+    halfway through.
+    """
+    formats = [date_format] if date_format else list(DATE_FORMATS)
+    rows = iter(rows)
+    held = []
+    if len(formats) > 1:
+        for row in rows:
+            fits = [fmt for fmt in formats if _parse_date(row[0], fmt)]
+            if not fits:
+                stats["skipped"] += 1
+                continue
+            held.append(row)
+            formats = fits
+            if len(formats) == 1:
+                break
+    
+    # Statements repeat the same dates a lot, so each text is parsed once
+    fmt, cache = formats[0], {}
+    for date, amount, description, category in itertools.chain(held, rows):
+        iso = cache.get(date)
+        if iso is None:
+            iso = cache[date] = _parse_date(date, fmt) or ""
+        if not iso:
+            stats["skipped"] += 1
+            continue
+        yield iso, amount, description, category
+
+def open_store(path=None):
+    """Pick the backend from the file name: .db/.sqlite is SQLite, anything else the JSON journal"""
+    if path and path.endswith((".db", ".sqlite")):
+        return SQLiteStore(path)
+    if path:
+        return JournalStore(path, os.path.splitext(path)[0] + ".journal")
+    return JournalStore()
+
+def _file_id(path):
+    """Identity of the file at path; changes whenever a new version is renamed over it"""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+def _atomic_write(path, write):
+    """Call write(f) on a temp file, fsync it and rename it over path"""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        write(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    _fsync_dir(path)
+
+def _fsync_dir(path):
+    """Make a rename durable by syncing its directory (no-op where unsupported)"""
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+class ExpenseTracker:
+    def __init__(self, store=None):
         self.categories = ["Food", "Transport", "Entertainment", "Bills", "Other"]
+        self.store = store or JournalStore()
         self.load_expenses()
     
-    def add_expense(self, amount, category, description=""):
+    @property
+    def expenses(self):
+        # The store may swap in a new list when another process compacts the files
+        return self.store.expenses
+    
+    def add_expense(self, amount, category, description="", quiet=False):
         """Add a new expense"""
         expense = {
             "amount": amount,
@@ -18,56 +1004,178 @@ class ExpenseTracker:
             "description": description,
             "date": str(datetime.date.today())
         }
-        self.expenses.append(expense)
-        self.save_expenses()
-        print(f"Added: ${amount} - {category}")
+        self.store.add(expense)
+        if not quiet:
+            print(f"Added: ${amount} - {category}")
+    
+    def add_expenses(self, expenses):
+        """Add many expense dicts in one batch"""
+        self.store.add_many(expenses)
+    
+    def import_statement(self, path, rules=None, batch_size=IMPORT_BATCH, date_format=None, expense_sign=-1):
+        """Bulk import a bank CSV/OFX export, skipping rows that are already stored
+        
+        A row counts as a duplicate when the store already holds an expense with the
+        same date, amount and description. Repeats are counted: if the store has one
+        $4.50 coffee on a day and the statement has two, the second one is imported.
+        Rows with an unreadable date or amount are counted in stats["skipped"].
+        """
+        rules = rules or CategoryRules()
+        self.store.refresh()
+        known = {}
+        for key in self.expenses.keys():
+            h = hash(tuple(key))
+            known[h] = known.get(h, 0) + 1
+        
+        stats = {"imported": 0, "duplicates": 0, "skipped": 0}
+        batch = []
+        with self.store.bulk():
+            for date, amount, description, category in read_statement(path, date_format, expense_sign, stats):
+                h = hash((date, amount, description))
+                if known.get(h):
+                    known[h] -= 1
+                    stats["duplicates"] += 1
+                    continue
+                batch.append({"amount": amount, "category": category or rules.categorize(description),
+                              "description": description, "date": date})
+                if len(batch) >= batch_size:
+                    self.store.add_many(batch)
+                    stats["imported"] += len(batch)
+                    batch = []
+            if batch:
+                self.store.add_many(batch)
+                stats["imported"] += len(batch)
+        return stats
     
     def view_expenses(self):
         """Display all expenses"""
+        self.store.refresh()
         if not self.expenses:
             print("No expenses recorded.")
             return
         
         print("\nYour Expenses:")
         print("-" * 50)
-        total = 0
         for i, expense in enumerate(self.expenses, 1):
             print(f"{i}. ${expense['amount']:.2f} - {expense['category']}")
             print(f"   {expense['date']} | {expense['description']}")
-            total += expense['amount']
         print("-" * 50)
-        print(f"Total: ${total:.2f}")
+        print(f"Total: ${self.store.total():.2f}")
     
     def get_category_total(self):
         """Show spending by category"""
-        if not self.expenses:
+        category_totals = self.store.category_totals()
+        if not category_totals:
             print("No expenses to analyze.")
             return
         
-        category_totals = {}
-        for expense in self.expenses:
-            category = expense['category']
-            category_totals[category] = category_totals.get(category, 0) + expense['amount']
-        
         print("\nSpending by Category:")
         for category, total in category_totals.items():
             print(f"{category}: ${total:.2f}")
     
+    def get_summary(self):
+        """Show count, total and range of all expenses"""
+        summary = self.store.summary()
+        if not summary["count"]:
+            print("No expenses to analyze.")
+            return
+        
+        print("\nSummary:")
+        print(f"Expenses: {summary['count']}")
+        print(f"Total: ${summary['total']:.2f}")
+        print(f"Average: ${summary['total'] / summary['count']:.2f}")
+        print(f"Smallest: ${summary['min']:.2f} | Largest: ${summary['max']:.2f}")
+    
+    def get_month_total(self):
+        """Show spending by month"""
+        month_totals = self.store.month_totals()
+        if not month_totals:
+            print("No expenses to analyze.")
+            return
+        
+        print("\nSpending by Month:")
+        for month, total in month_totals.items():
+            print(f"{month}: ${total:.2f}")
+    
+    def view_between(self, start, end):
+        """Show expenses within a date range"""
+        expenses = self.store.between(start, end)
+        if not expenses:
+            print("No expenses in that range.")
+            return
+        
+        print(f"\nExpenses {start} to {end}:")
+        for expense in expenses:
+            print(f"{expense['date']} ${expense['amount']:.2f} - {expense['category']} | {expense['description']}")
+        print(f"Total: ${sum(e['amount'] for e in expenses):.2f}")
+    
+    def view_top(self, n=10):
+        """Show the largest expenses"""
+        expenses = self.store.top(n)
+        if not expenses:
+            print("No expenses recorded.")
+            return
+        
+        print(f"\nTop {len(expenses)} Expenses:")
+        for i, expense in enumerate(expenses, 1):
+            print(f"{i}. ${expense['amount']:.2f} - {expense['category']} ({expense['date']})")
+    
+    def report(self):
+        """ExpenseReport over the current expenses (copied into columns for SQLite)"""
+        self.store.refresh()
+        expenses = self.expenses
+        if not isinstance(expenses, ExpenseColumns):
+            expenses = ExpenseColumns(expenses)
+        return ExpenseReport(expenses)
+    
+    def view_trends(self, budget=None):
+        """Show weekly totals, the 7-day average, per-category percentiles and this month's burn-down"""
+        if not len(self.expenses):
+            print("No expenses to analyze.")
+            return
+        
+        report = self.report()
+        print("\nLast 8 Weeks:")
+        for week, total in list(report.rollup("week").items())[-8:]:
+            print(f"{week}: ${total:.2f}")
+        averages = report.moving_average(7)
+        if averages:
+            day, average = next(reversed(averages.items()))
+            print(f"7-day average ({day}): ${average:.2f}/day")
+        
+        print("\nExpense Size by Category:")
+        for category, stats in report.category_percentiles().items():
+            print(f"{category}: median ${stats['median']:.2f} | p90 ${stats['p90']:.2f} | "
+                  f"max ${stats['max']:.2f} ({stats['count']} expenses)")
+        
+        if budget:
+            today = datetime.date.today()
+            start = today.replace(day=1)
+            end = (start + datetime.timedelta(days=32)).replace(day=1) - datetime.timedelta(days=1)
+            rows = report.burn_down(budget, str(start), str(end))
+            row = rows[today.day - 1]
+            status = "ahead of" if row["remaining"] >= row["ideal"] else "behind"
+            print(f"\nBudget ${budget:.2f} for {start:%B %Y}: ${row['remaining']:.2f} left, "
+                  f"{status} plan (${row['ideal']:.2f} planned)")
+    
     def save_expenses(self):
         """Save expenses to file"""
         try:
-            with open("expenses.json", "w") as f:
-                json.dump(self.expenses, f)
-        except:
-            print("Error saving expenses")
+            self.store.save()
+        except OSError as e:
+            print(f"Error saving expenses: {e}")
     
     def load_expenses(self):
-        """Load expenses from file"""
-        try:
-            with open("expenses.json", "r") as f:
-                self.expenses = json.load(f)
-        except:
-            self.expenses = []
+        """Load expenses from file
+        
+        A damaged file raises instead of loading as an empty list, which the
+        next save would have written over the real data.
+        """
+        self.store.load()
+    
+    def close(self):
+        """Flush pending changes before exiting"""
+        self.store.close()
 
 def get_amount():
     """Get valid amount from user"""
@@ -95,18 +1203,39 @@ def get_category(tracker):
         except ValueError:
             print("Please enter a valid number.")
 
+def get_date(prompt):
+    """Get an ISO date (YYYY-MM-DD) from user"""
+    while True:
+        text = input(prompt).strip()
+        try:
+            return str(datetime.date.fromisoformat(text))
+        except ValueError:
+            print("Please use the format YYYY-MM-DD.")
+
 def main():
     """Main program"""
-    tracker = ExpenseTracker()
+    # Optional storage path argument, e.g. expenses.db for the SQLite backend
+    try:
+        tracker = ExpenseTracker(open_store(sys.argv[1] if len(sys.argv) > 1 else None))
+    except (OSError, ValueError) as e:
+        print(f"Could not load expenses: {e}")
+        print("Fix or move the file aside; nothing was changed.")
+        return
     
     while True:
         print("\n--- EXPENSE TRACKER ---")
         print("1. Add Expense")
         print("2. View Expenses")
         print("3. Category Summary")
-        print("4. Exit")
+        print("4. Monthly Summary")
+        print("5. Expenses by Date Range")
+        print("6. Top Expenses")
+        print("7. Overall Summary")
+        print("8. Import Bank Statement")
+        print("9. Trends & Budget")
+        print("10. Exit")
         
-        choice = input("Choose (1-4): ")
+        choice = input("Choose (1-10): ")
         
         if choice == "1":
             amount = get_amount()
@@ -121,6 +1250,38 @@ def main():
             tracker.get_category_total()
         
         elif choice == "4":
+            tracker.get_month_total()
+        
+        elif choice == "5":
+            tracker.view_between(get_date("Start date (YYYY-MM-DD): "), get_date("End date (YYYY-MM-DD): "))
+        
+        elif choice == "6":
+            tracker.view_top()
+        
+        elif choice == "7":
+            tracker.get_summary()
+        
+        elif choice == "8":
+            path = input("Statement file (CSV or OFX): ").strip()
+            try:
+                stats = tracker.import_statement(path)
+                print(f"Imported {stats['imported']} expenses, skipped {stats['duplicates']} duplicates")
+                if stats['skipped']:
+                    print(f"Skipped {stats['skipped']} rows with a date or amount that couldn't be read")
+            except (OSError, ValueError) as e:
+                print(f"Import failed: {e}")
+        
+        elif choice == "9":
+            budget = input("Monthly budget (optional): $").strip()
+            try:
+                budget = float(budget) if budget else None
+            except ValueError:
+                print("Please enter a valid number.")
+                continue
+            tracker.view_trends(budget)
+        
+        elif choice == "10":
+            tracker.close()
             print("Goodbye!")
             break
         
@@ -0,0 +1,51 @@
+import os
+import sys
+import time
+import tempfile
+
+from day4_PasswordGenerator import PasswordGenerator
+
+def rate(label, count, func):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {count / elapsed:12,.0f} passwords/sec")
+
+def bench_generate(count):
+    gen = PasswordGenerator()
+    legacy = min(count, 50_000)
+    rate("generate_password loop", legacy, lambda: [gen.generate_password() for _ in range(legacy)])
+    rate("generate_batch", count, lambda: gen.generate_batch(count))
+
+def bench_strength(count, workers):
+    gen = PasswordGenerator()
+    passwords = gen.generate_batch(count)
+    sample = passwords[:50_000]
+    rate("check_strength loop", len(sample), lambda: [gen.check_strength(p) for p in sample])
+    rate(f"check_strength_batch x{workers}", count,
+         lambda: gen.check_strength_batch(passwords, workers=workers))
+
+def bench_write(count, workers):
+    gen = PasswordGenerator()
+    for fmt in ('lines', 'ndjson', 'csv'):
+        fd, path = tempfile.mkstemp(suffix=f'.{fmt}')
+        os.close(fd)
+        try:
+            rate(f"write_passwords {fmt} x{workers}", count,
+                 lambda: gen.write_passwords(count, path, fmt=fmt, workers=workers))
+        finally:
+            os.remove(path)
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+    bench_generate(count)
+    bench_strength(count, 1)
+    if workers > 1:
+        bench_strength(count, workers)
+    bench_write(count, 1)
+    if workers > 1:
+        bench_write(count, workers)
+
+if __name__ == "__main__":
+    main()
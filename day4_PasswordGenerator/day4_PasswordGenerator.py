@@ -1,15 +1,468 @@
+import io
+import os
+import re
+import csv
+import math
+import mmap
+import heapq
+import pickle
+import hashlib
+import tempfile
 import random
 import string
 import secrets
 import json
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import reduce
+from itertools import islice
+from operator import or_
+
+RANDOM_BLOCK = 1 << 16
+STREAM_BATCH = 10_000
+WRITE_FORMATS = ('lines', 'ndjson', 'csv')
+
+LOWER, UPPER, DIGIT, SPECIAL = 1, 2, 4, 8
+CLASS_RULES = [(LOWER, 15, "Add lowercase letters"), (UPPER, 15, "Add uppercase letters"),
+               (DIGIT, 15, "Add numbers"), (SPECIAL, 20, "Add special characters")]
+# Points earned by every combination of character classes
+CLASS_POINTS = tuple(sum(points for bit, points, _ in CLASS_RULES if mask & bit) for mask in range(16))
+STRENGTH_LEVELS = [(90, "Very Strong"), (70, "Strong"), (50, "Medium"), (30, "Weak")]
+STRENGTH_BY_SCORE = tuple(next((level for threshold, level in STRENGTH_LEVELS if score >= threshold), "Very Weak")
+                          for score in range(101))
+
+BREACH_MAGIC = b'BREACH01'
+PREFIX_SLOTS = 1 << 16
+BREACH_RUN_SIZE = 2_000_000
+
+def _breach_hash(data):
+    return hashlib.blake2b(data, digest_size=8).digest()
+
+def _read_records(f, block=1 << 16):
+    while True:
+        data = f.read(8 * block)
+        if not data:
+            return
+        for i in range(0, len(data), 8):
+            yield data[i:i + 8]
+
+def build_breach_index(source, index_path=None, run_size=BREACH_RUN_SIZE):
+    """Turn a one-password-per-line list into a sorted hash index for BreachIndex.
+
+    Lines are hashed to 8 bytes and sorted in runs of run_size, then the runs
+    are merged on disk, so lists far larger than RAM can be indexed.
+    """
+    index_path = index_path or source + '.idx'
+    runs = []
+    try:
+        with open(source, 'rb') as f:
+            while True:
+                lines = list(islice(f, run_size))
+                if not lines:
+                    break
+                hashes = sorted({_breach_hash(line.rstrip(b'\r\n')) for line in lines if line.strip()})
+                run = tempfile.TemporaryFile()
+                run.write(b''.join(hashes))
+                run.seek(0)
+                runs.append(run)
+        
+        # offsets[k] = index of the first record whose 2-byte prefix is >= k
+        offsets = array('Q', bytes(8 * (PREFIX_SLOTS + 1)))
+        with open(index_path + '.tmp', 'wb') as out:
+            out.write(BREACH_MAGIC)
+            out.write(offsets.tobytes())
+            prev = None
+            for record in heapq.merge(*map(_read_records, runs)):
+                if record != prev:
+                    out.write(record)
+                    offsets[(record[0] << 8 | record[1]) + 1] += 1
+                    prev = record
+            for i in range(1, PREFIX_SLOTS + 1):
+                offsets[i] += offsets[i - 1]
+            out.seek(len(BREACH_MAGIC))
+            out.write(offsets.tobytes())
+        os.replace(index_path + '.tmp', index_path)
+    finally:
+        for run in runs:
+            run.close()
+    return index_path
+
+class BreachIndex:
+    """Memory-mapped, sorted set of password hashes built by build_breach_index().
+
+    Opening is instant whatever the list size; a lookup is a prefix-table jump
+    followed by a binary search over a few thousand 8-byte records.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(BREACH_MAGIC)] != BREACH_MAGIC:
+            self._mm.close()
+            raise ValueError(f"{path} is not a breach index")
+        self._base = len(BREACH_MAGIC) + 8 * (PREFIX_SLOTS + 1)
+        self._offsets = array('Q', self._mm[len(BREACH_MAGIC):self._base])
+    
+    def __len__(self):
+        return self._offsets[-1]
+    
+    def __contains__(self, password):
+        key = _breach_hash(password.encode('utf-8', 'surrogateescape'))
+        slot = key[0] << 8 | key[1]
+        lo, hi = self._offsets[slot], self._offsets[slot + 1]
+        mm, base = self._mm, self._base
+        while lo < hi:
+            mid = (lo + hi) // 2
+            pos = base + 8 * mid
+            if mm[pos:pos + 8] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        pos = base + 8 * lo
+        return lo < self._offsets[slot + 1] and mm[pos:pos + 8] == key
+    
+    def close(self):
+        self._mm.close()
+
+class _CharClasses(dict):
+    """Character -> class bits; ASCII is precomputed, anything else is classified on first sight."""
+
+    def __init__(self, special_chars):
+        super().__init__()
+        self.special = frozenset(special_chars)
+        for i in range(128):
+            self[chr(i)] = self._classify(chr(i))
+    
+    def __missing__(self, c):
+        bits = self[c] = self._classify(c)
+        return bits
+    
+    def _classify(self, c):
+        return ((LOWER if c.islower() else 0) | (UPPER if c.isupper() else 0)
+                | (DIGIT if c.isdigit() else 0) | (SPECIAL if c in self.special else 0))
+
+class _CharStream:
+    """Uniform characters from one alphabet, cut from large CSPRNG byte blocks.
+
+    Bytes at or above the largest multiple of len(alphabet) are dropped
+    (rejection sampling), so the modulo mapping has no bias.
+    """
+
+    def __init__(self, alphabet, block=RANDOM_BLOCK):
+        n = len(alphabet)
+        limit = 256 - 256 % n
+        self.table = bytes(ord(alphabet[b % n]) if b < limit else 0 for b in range(256))
+        self.delete = bytes(range(limit, 256))
+        self.block = block
+        self.buf = b''
+        self.pos = 0
+    
+    def take(self, k):
+        while len(self.buf) - self.pos < k:
+            fresh = secrets.token_bytes(max(self.block, 2 * k)).translate(self.table, self.delete)
+            self.buf = self.buf[self.pos:] + fresh
+            self.pos = 0
+        out = self.buf[self.pos:self.pos + k]
+        self.pos += k
+        return out
+
+class _IndexStream:
+    """Unbiased random integers in [0, bound) from blocks of 32-bit CSPRNG words."""
+
+    def __init__(self, block=RANDOM_BLOCK):
+        self.block = block
+        self.words = array('I')
+        self.pos = 0
+    
+    def below(self, bound):
+        limit = (1 << 32) - (1 << 32) % bound
+        while True:
+            if self.pos == len(self.words):
+                self.words = array('I', secrets.token_bytes(4 * self.block))
+                self.pos = 0
+            x = self.words[self.pos]
+            self.pos += 1
+            if x < limit:
+                return x % bound
+
+class _BatchEngine:
+    """Mints passwords for one option set; the alphabets are built once."""
+
+    def __init__(self, charset, required_sets, length):
+        self.length = length
+        # Most entropy-estimator bits any password from this engine can score
+        self.max_bits = length * max(map(_bruteforce_bits, set(charset)))
+        self.body = _CharStream(charset)
+        self.required = [_CharStream(chars) for chars in required_sets]
+        self.index = _IndexStream()
+    
+    def generate(self, count):
+        body_len = self.length - len(self.required)
+        bodies = self.body.take(count * body_len).decode('ascii')
+        required = [stream.take(count).decode('ascii') for stream in self.required]
+        below = self.index.below
+        passwords = []
+        for i in range(count):
+            password = list(bodies[i * body_len:(i + 1) * body_len])
+            # Inserting each required char at a uniform position is equivalent to
+            # shuffling required + body, since the body chars are i.i.d.
+            for chars in required:
+                password.insert(below(len(password) + 1), chars[i])
+            passwords.append(''.join(password))
+        return passwords
+
+ENTROPY_CACHE = os.path.join(os.path.expanduser('~'), '.cache', 'pwgen_entropy.pickle')
+ENTROPY_TABLES_VERSION = 1
+COMMON_PASSWORDS = (
+    "password", "123456", "12345678", "qwerty", "abc123", "letmein", "monkey", "dragon",
+    "111111", "baseball", "iloveyou", "trustno1", "sunshine", "master", "welcome", "shadow",
+    "ashley", "football", "jesus", "michael", "ninja", "mustang", "admin", "login", "princess",
+    "starwars", "superman", "batman", "hello", "freedom", "whatever", "charlie", "jessica",
+    "secret", "love", "summer", "winter", "spring", "autumn", "pass", "test", "guest", "user",
+    "root", "computer", "internet", "access", "killer", "soccer", "hockey", "ranger", "buster",
+    "thomas", "tigger", "robert", "jordan", "hunter", "harley", "matrix", "pepper", "cheese",
+    "orange", "apple", "banana", "chocolate", "flower", "family", "forever", "friend", "house",
+    "money", "music", "purple", "silver", "yellow", "google", "samsung", "pokemon", "naruto",
+    "angel", "baby", "cookie", "daniel", "maggie", "ginger", "joshua", "qazwsx", "zxcvbnm",
+)
+KEYBOARD_ROWS = [("`1234567890-=", "~!@#$%^&*()_+", 0.0), ("qwertyuiop[]\\", "QWERTYUIOP{}|", 1.5),
+                 ("asdfghjkl;'", 'ASDFGHJKL:"', 1.75), ("zxcvbnm,./", "ZXCVBNM<>?", 2.25)]
+KEYBOARD_SHIFTED = frozenset(''.join(shifted for _, shifted, _ in KEYBOARD_ROWS))
+UNLEET = str.maketrans({'@': 'a', '4': 'a', '0': 'o', '1': 'i', '!': 'i', '3': 'e',
+                        '$': 's', '5': 's', '7': 't', '+': 't', '|': 'l', '9': 'g'})
+DATE_PATTERN = re.compile(r'(?<!\d)(?:(\d{1,2})([-/. ]?)(\d{1,2})\2(\d{4}|\d{2})'
+                          r'|(\d{4})([-/. ]?)(\d{1,2})\6(\d{1,2}))(?!\d)')
+YEAR_PATTERN = re.compile(r'(?<!\d)(19\d\d|20\d\d)(?!\d)')
+REPEAT_PATTERN = re.compile(r'(.+?)\1+')
+# log2 of guesses that mark zxcvbn's 0-4 crack scores (1e3, 1e6, 1e8, 1e10)
+CRACK_THRESHOLDS = (9.97, 19.93, 26.58, 33.22)
+MAX_SCORE_ATTEMPTS = 1000  # candidates per wanted password before min_crack_score gives up
+
+def _char_kind(c):
+    return 'digit' if c.isdigit() else 'lower' if c.islower() else 'upper' if c.isupper() else 'other'
+
+def _bruteforce_bits(c):
+    return math.log2(10 if c.isdigit() else 26 if c.isalpha() and c.isascii() else 33)
+
+def _case_variations(word):
+    upper = sum(1 for c in word if c.isupper())
+    lower = sum(1 for c in word if c.islower())
+    if not upper or word.islower():
+        return 1
+    if not lower or (upper == 1 and (word[0].isupper() or word[-1].isupper())):
+        return 2
+    return sum(math.comb(upper + lower, k) for k in range(1, min(upper, lower) + 1))
+
+def _build_entropy_tables(wordlist=None):
+    words = list(COMMON_PASSWORDS)
+    if wordlist:
+        with open(wordlist, 'r', encoding='utf-8', errors='ignore') as f:
+            words.extend(line.strip().lower() for line in f if line.strip())
+    ranked = {}
+    for rank, word in enumerate(words, 1):
+        ranked.setdefault(word, rank)
+    prefixes = {word[:i] for word in ranked for i in range(1, len(word) + 1)}
+    
+    positions = {}
+    for row, (plain, shifted, offset) in enumerate(KEYBOARD_ROWS):
+        for col, (lo, hi) in enumerate(zip(plain, shifted)):
+            positions[lo] = positions[hi] = (row, offset + col)
+    adjacency = {}
+    for char, (row, x) in positions.items():
+        adjacency[char] = frozenset(other for other, (r, ox) in positions.items()
+                                    if abs(r - row) <= 1 and abs(ox - x) <= 1 and (r, ox) != (row, x))
+    keys = len(positions) // 2
+    avg_degree = sum(map(len, adjacency.values())) / len(adjacency) / 2
+    return {'version': ENTROPY_TABLES_VERSION, 'ranked': ranked, 'prefixes': prefixes,
+            'max_word': max(map(len, ranked)), 'positions': positions, 'adjacency': adjacency,
+            'keys': keys, 'avg_degree': avg_degree}
+
+class EntropyEstimator:
+    """zxcvbn-style guess estimator: dictionary, keyboard walk, sequence, date and repeat matches.
+
+    The word ranks, prefix set (used as a trie to stop substring scans early)
+    and keyboard adjacency are built once and pickled to cache_path.
+    """
+
+    def __init__(self, tables):
+        self.__dict__.update(tables)
+    
+    @classmethod
+    def load(cls, wordlist=None, cache_path=ENTROPY_CACHE):
+        source = None
+        if wordlist:
+            st = os.stat(wordlist)
+            source = (os.path.abspath(wordlist), st.st_size, st.st_mtime)
+        try:
+            with open(cache_path, 'rb') as f:
+                tables = pickle.load(f)
+            if tables.get('version') == ENTROPY_TABLES_VERSION and tables.get('source') == source:
+                return cls(tables)
+        except (OSError, pickle.PickleError, EOFError, AttributeError):
+            pass
+        
+        tables = _build_entropy_tables(wordlist)
+        tables['source'] = source
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            # Pool workers may build the cache at the same time, so each writes its own temp file
+            tmp = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp, 'wb') as f:
+                pickle.dump(tables, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, cache_path)
+        except OSError:
+            pass
+        return cls(tables)
+    
+    def estimate(self, password):
+        bits, matches = self._min_bits(password)
+        return {
+            'entropy_bits': round(bits, 1),
+            'guesses_log10': round(bits * math.log10(2), 2),
+            'crack_score': sum(bits >= t for t in CRACK_THRESHOLDS),
+            'patterns': [pattern for pattern, _, _ in matches]
+        }
+    
+    def crack_score(self, password):
+        bits = self._min_bits(password)[0]
+        return sum(bits >= t for t in CRACK_THRESHOLDS)
+    
+    def _min_bits(self, password):
+        # Cheapest cover of the password by matches and brute-forced characters
+        n = len(password)
+        if not n:
+            return 0.0, []
+        ending = [[] for _ in range(n + 1)]
+        for match in self._matches(password):
+            ending[match[2]].append(match)
+        best = [0.0] + [math.inf] * n
+        back = [None] * (n + 1)
+        for k in range(1, n + 1):
+            best[k] = best[k - 1] + _bruteforce_bits(password[k - 1])
+            for pattern, i, j, bits in ending[k]:
+                if best[i] + bits < best[k]:
+                    best[k] = best[i] + bits
+                    back[k] = (pattern, i, j)
+        matches, k = [], n
+        while k:
+            if back[k]:
+                matches.append(back[k])
+                k = back[k][1]
+            else:
+                k -= 1
+        return best[n], matches[::-1]
+    
+    def _matches(self, password):
+        yield from self._dictionary(password)
+        yield from self._spatial(password)
+        yield from self._sequences(password)
+        yield from self._dates(password)
+        yield from self._repeats(password)
+    
+    def _dictionary(self, password):
+        lower = password.lower()
+        variants = [(lower, 1)]
+        unleet = lower.translate(UNLEET)
+        if unleet != lower:
+            variants.append((unleet, 2))
+        for text, leet_factor in variants:
+            for i in range(len(text)):
+                for j in range(i + 1, min(len(text), i + self.max_word) + 1):
+                    word = text[i:j]
+                    if word not in self.prefixes:
+                        break
+                    rank = self.ranked.get(word)
+                    if rank:
+                        guesses = rank * _case_variations(password[i:j]) * leet_factor
+                        yield ('dictionary', i, j, math.log2(max(guesses, 2)))
+    
+    def _spatial(self, password):
+        i, n = 0, len(password)
+        while i < n - 2:
+            j = i + 1
+            turns, direction = 0, None
+            while j < n and password[j] in self.adjacency.get(password[j - 1], ()):
+                (r0, x0), (r1, x1) = self.positions[password[j - 1]], self.positions[password[j]]
+                step = (r1 - r0, x1 - x0)
+                if step != direction:
+                    turns += 1
+                    direction = step
+                j += 1
+            if j - i >= 3:
+                yield ('spatial', i, j, math.log2(self._spatial_guesses(password[i:j], turns)))
+                i = j
+            else:
+                i += 1
+    
+    def _spatial_guesses(self, walk, turns):
+        length = len(walk)
+        guesses = 0
+        for i in range(2, length + 1):
+            for j in range(1, min(turns, i - 1) + 1):
+                guesses += math.comb(i - 1, j - 1) * self.keys * self.avg_degree ** j
+        shifted = sum(1 for c in walk if c in KEYBOARD_SHIFTED)
+        unshifted = length - shifted
+        if shifted and unshifted:
+            guesses *= sum(math.comb(length, k) for k in range(1, min(shifted, unshifted) + 1))
+        elif shifted:
+            guesses *= 2
+        return max(guesses, 2)
+    
+    def _sequences(self, password):
+        i, n = 0, len(password)
+        while i < n - 2:
+            delta = ord(password[i + 1]) - ord(password[i])
+            j = i + 1
+            if delta in (1, -1):
+                while (j < n and ord(password[j]) - ord(password[j - 1]) == delta
+                       and _char_kind(password[j]) == _char_kind(password[i])):
+                    j += 1
+            if j - i >= 3:
+                first = password[i]
+                base = 4 if first in 'aAzZ019' else 10 if first.isdigit() else 26
+                guesses = base * (j - i) * (2 if delta < 0 else 1)
+                yield ('sequence', i, j, math.log2(guesses))
+                i = j
+            else:
+                i += 1
+    
+    def _dates(self, password):
+        # Guesses count years away from now, as zxcvbn does
+        this_year = datetime.now().year
+        for m in DATE_PATTERN.finditer(password):
+            if m.group(1):
+                a, sep, b, year = int(m.group(1)), m.group(2), int(m.group(3)), int(m.group(4))
+            else:
+                year, sep, a, b = int(m.group(5)), m.group(6), int(m.group(7)), int(m.group(8))
+            if year < 100:
+                year += 1900 if year > 50 else 2000
+            if not (1 <= min(a, b) and max(a, b) <= 31 and min(a, b) <= 12):
+                continue
+            guesses = 365 * max(abs(year - this_year), 20) * (4 if sep else 1)
+            yield ('date', m.start(), m.end(), math.log2(guesses))
+        for m in YEAR_PATTERN.finditer(password):
+            yield ('year', m.start(), m.end(), math.log2(max(abs(int(m.group()) - this_year), 20)))
+    
+    def _repeats(self, password):
+        for m in REPEAT_PATTERN.finditer(password):
+            unit = m.group(1)
+            count = (m.end() - m.start()) // len(unit)
+            unit_bits = self._min_bits(unit)[0] if len(unit) > 1 else _bruteforce_bits(unit)
+            yield ('repeat', m.start(), m.end(), unit_bits + math.log2(count))
 
 class PasswordGenerator:
-    def __init__(self):
+    def __init__(self, breach_index=None):
         self.lowercase = string.ascii_lowercase
         self.uppercase = string.ascii_uppercase
         self.digits = string.digits
         self.special_chars = "!@#$%^&*()_+-=[]{}|;:,.<>?"
+        self._engines = {}
+        self._classes = _CharClasses(self.special_chars)
+        self.breached = BreachIndex(breach_index) if isinstance(breach_index, str) else breach_index
+        self._estimator = None
         
     def generate_password(self, length=12, uppercase=True, lowercase=True, 
                          digits=True, special=True, no_ambiguous=False):
@@ -46,50 +499,171 @@ class PasswordGenerator:
         secrets.SystemRandom().shuffle(password)
         return ''.join(password)
     
-    def generate_batch(self, count=5, **kwargs):
-        return [self.generate_password(**kwargs) for _ in range(count)]
+    def generate_batch(self, count=5, length=12, uppercase=True, lowercase=True,
+                       digits=True, special=True, no_ambiguous=False, min_crack_score=None):
+        """Generate count passwords with the same guarantees as generate_password().
+
+        With min_crack_score (0-4), outputs the entropy estimator rates lower
+        are discarded and replaced. A score these options can't reach, or
+        reach only rarely, raises ValueError instead of looping forever.
+        """
+        key = (length, uppercase, lowercase, digits, special, no_ambiguous)
+        engine = self._engines.get(key)
+        if engine is None:
+            engine = self._engines[key] = self._build_engine(*key)
+        if min_crack_score is None:
+            return engine.generate(count)
+        if min_crack_score not in range(len(CRACK_THRESHOLDS) + 1):
+            raise ValueError("min_crack_score must be 0-4")
+        if min_crack_score and engine.max_bits < CRACK_THRESHOLDS[min_crack_score - 1]:
+            raise ValueError(f"{length}-character passwords with these options can't reach "
+                             f"crack score {min_crack_score}; use a longer length")
+        
+        crack_score = self.estimator().crack_score
+        passwords = []
+        attempts = 0
+        while len(passwords) < count:
+            if attempts >= MAX_SCORE_ATTEMPTS * count:
+                raise ValueError(f"Too few {length}-character passwords reach crack score "
+                                 f"{min_crack_score}; use a longer length")
+            batch = engine.generate(count - len(passwords))
+            attempts += len(batch)
+            passwords.extend(p for p in batch if crack_score(p) >= min_crack_score)
+        return passwords
+    
+    def estimator(self):
+        if self._estimator is None:
+            self._estimator = EntropyEstimator.load()
+        return self._estimator
+    
+    def _build_engine(self, length, uppercase, lowercase, digits, special, no_ambiguous):
+        if length < 4:
+            raise ValueError("Password must be at least 4 characters")
+        
+        required = []
+        if lowercase:
+            required.append(self.lowercase if not no_ambiguous else self.lowercase.replace('l', ''))
+        if uppercase:
+            required.append(self.uppercase if not no_ambiguous else self.uppercase.replace('O', ''))
+        if digits:
+            required.append(self.digits if not no_ambiguous else self.digits.replace('0', '').replace('1', ''))
+        if special:
+            required.append(self.special_chars)
+        
+        if not required:
+            raise ValueError("Select at least one character type")
+        return _BatchEngine(''.join(required), required, length)
     
     def check_strength(self, password):
-        score = 0
+        score, classes, unique, breached = self._score(password)
         tips = []
         
-        if len(password) >= 12:
-            score += 25
-        elif len(password) >= 8:
-            score += 15
-            tips.append("Use 12+ characters")
-        else:
+        if breached:
+            tips.append("Found in a breached password list - never use it")
+        if len(password) < 8:
             tips.append("Too short (min 8 chars)")
+        elif len(password) < 12:
+            tips.append("Use 12+ characters")
+        tips.extend(tip for bit, _, tip in CLASS_RULES if not classes & bit)
+        if not unique:
+            tips.append("Avoid repeated characters")
         
-        if any(c.islower() for c in password):
-            score += 15
-        else:
-            tips.append("Add lowercase letters")
-        
-        if any(c.isupper() for c in password):
-            score += 15
-        else:
-            tips.append("Add uppercase letters")
-        
-        if any(c.isdigit() for c in password):
-            score += 15
-        else:
-            tips.append("Add numbers")
+        entropy = self.estimator().estimate(password)
+        if entropy['patterns']:
+            tips.append(f"Avoid predictable patterns ({', '.join(dict.fromkeys(entropy['patterns']))})")
         
-        if any(c in self.special_chars for c in password):
-            score += 20
-        else:
-            tips.append("Add special characters")
+        return {"score": score, "strength": STRENGTH_BY_SCORE[score], "tips": tips,
+                "entropy_bits": entropy['entropy_bits'], "crack_score": entropy['crack_score']}
+    
+    def _score(self, password):
+        # set() is the only scan over the password; classes come from its distinct chars
+        chars = set(password)
+        classes = reduce(or_, map(self._classes.__getitem__, chars), 0)
+        unique = len(chars) == len(password)
+        score = (25 if len(password) >= 12 else 15 if len(password) >= 8 else 0)
+        score += CLASS_POINTS[classes] + (10 if unique else 0)
+        breached = self.is_breached(password)
+        if breached:
+            score = 0
+        return score, classes, unique, breached
+    
+    def is_breached(self, password):
+        return self.breached is not None and password in self.breached
+    
+    def rate(self, password):
+        score = self._score(password)[0]
+        return score, STRENGTH_BY_SCORE[score]
+    
+    def check_strength_batch(self, passwords, workers=1, chunk_size=STREAM_BATCH):
+        """Return a (score, strength) tuple per password, in input order.
+
+        passwords may be any iterable (e.g. lines of a file); with workers > 1
+        chunks of it are scored in a process pool. Only a few chunks are read
+        ahead at once, so a large dump is never held in memory whole.
+        """
+        if workers == 1:
+            return list(map(self.rate, passwords))
         
-        if len(set(password)) == len(password):
-            score += 10
-        else:
-            tips.append("Avoid repeated characters")
+        workers = workers or os.cpu_count() or 1
+        results = []
+        passwords = iter(passwords)
+        chunks = iter(lambda: list(islice(passwords, chunk_size)), [])
+        # Workers reopen a BreachIndex from its path; any other container is sent to them as is
+        breached = self.breached.path if isinstance(self.breached, BreachIndex) else self.breached
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(breached,)) as pool:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(pool.submit(_rate_chunk, chunk))
+                if len(pending) >= 2 * workers:
+                    results.extend(pending.popleft().result())
+            while pending:
+                results.extend(pending.popleft().result())
+        return results
+    
+    def iter_passwords(self, count, batch_size=STREAM_BATCH, **options):
+        """Yield count passwords, generated batch_size at a time."""
+        remaining = count
+        while remaining > 0:
+            n = min(batch_size, remaining)
+            yield from self.generate_batch(n, **options)
+            remaining -= n
+    
+    def write_passwords(self, count, filename=None, fmt='lines', workers=1,
+                        batch_size=STREAM_BATCH, **options):
+        """Stream count passwords to a lines/ndjson/csv file in buffered batches.
+
+        With workers > 1 the batches are generated and formatted in a process
+        pool; each worker draws from the OS CSPRNG on its own. Only a few
+        batches are in flight at once, so memory stays flat for any count.
+        """
+        if fmt not in WRITE_FORMATS:
+            raise ValueError(f"Unknown format '{fmt}', choose from {', '.join(WRITE_FORMATS)}")
+        if not filename:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"passwords_{timestamp}.{'txt' if fmt == 'lines' else fmt}"
         
-        strength_levels = [(90, "Very Strong"), (70, "Strong"), (50, "Medium"), (30, "Weak")]
-        strength = next((level for threshold, level in strength_levels if score >= threshold), "Very Weak")
+        workers = workers or os.cpu_count() or 1
+        sizes = [batch_size] * (count // batch_size)
+        if count % batch_size:
+            sizes.append(count % batch_size)
         
-        return {"score": score, "strength": strength, "tips": tips}
+        with open(filename, 'w', newline='', buffering=1 << 20) as f:
+            if fmt == 'csv':
+                f.write("password\r\n")
+            if workers == 1:
+                for n in sizes:
+                    f.write(format_passwords(self.generate_batch(n, **options), fmt))
+            else:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    pending = deque()
+                    for n in sizes:
+                        pending.append(pool.submit(_generate_formatted, n, fmt, options))
+                        if len(pending) >= 2 * workers:
+                            f.write(pending.popleft().result())
+                    while pending:
+                        f.write(pending.popleft().result())
+        return filename
     
     def save_to_file(self, passwords, filename=None):
         if not filename:
@@ -106,6 +680,34 @@ class PasswordGenerator:
             json.dump(data, f, indent=2)
         return filename
 
+def format_passwords(passwords, fmt='lines'):
+    if fmt == 'ndjson':
+        return ''.join(f'{{"password": {json.dumps(p)}}}\n' for p in passwords)
+    if fmt == 'csv':
+        buf = io.StringIO()
+        csv.writer(buf).writerows([p] for p in passwords)
+        return buf.getvalue()
+    return '\n'.join(passwords) + '\n' if passwords else ''
+
+_worker_gen = None
+
+def _generate_formatted(count, fmt, options):
+    # One generator per worker process, so its engines are reused across batches
+    global _worker_gen
+    if _worker_gen is None:
+        _worker_gen = PasswordGenerator()
+    return format_passwords(_worker_gen.generate_batch(count, **options), fmt)
+
+def _init_worker(breach_index=None):
+    global _worker_gen
+    _worker_gen = PasswordGenerator(breach_index)
+
+def _rate_chunk(passwords):
+    global _worker_gen
+    if _worker_gen is None:
+        _worker_gen = PasswordGenerator()
+    return [_worker_gen.rate(p) for p in passwords]
+
 def get_int_input(prompt, default):
     try:
         return int(input(prompt) or str(default))
@@ -129,9 +731,11 @@ def main():
         print("2. Generate multiple passwords")
         print("3. Check password strength")
         print("4. Generate and save to file")
-        print("5. Exit")
+        print("5. Stream large batch to file")
+        print("6. Load breached password list")
+        print("7. Exit")
         
-        choice = input("\nChoice (1-5): ").strip()
+        choice = input("\nChoice (1-7): ").strip()
         
         if choice == '1':
             length = get_int_input("Length (12): ", 12)
@@ -150,6 +754,7 @@ def main():
                 strength = gen.check_strength(password)
                 print(f"\nPassword: {password}")
                 print(f"Strength: {strength['strength']} ({strength['score']}/100)")
+                print(f"Entropy: {strength['entropy_bits']} bits (crack score {strength['crack_score']}/4)")
                 
             except ValueError as e:
                 print(f"Error: {e}")
@@ -161,8 +766,8 @@ def main():
             passwords = gen.generate_batch(count=count, length=length)
             print(f"\nGenerated {count} passwords:")
             
-            for i, pwd in enumerate(passwords, 1):
-                strength = gen.check_strength(pwd)['strength']
+            ratings = gen.check_strength_batch(passwords)
+            for i, (pwd, (_, strength)) in enumerate(zip(passwords, ratings), 1):
                 print(f"{i:2}. {pwd} - {strength}")
         
         elif choice == '3':
@@ -170,6 +775,7 @@ def main():
             if password:
                 analysis = gen.check_strength(password)
                 print(f"\nStrength: {analysis['strength']} ({analysis['score']}/100)")
+                print(f"Entropy: {analysis['entropy_bits']} bits (crack score {analysis['crack_score']}/4)")
                 if analysis['tips']:
                     print("Tips:")
                     for tip in analysis['tips']:
@@ -184,6 +790,29 @@ def main():
             print(f"Saved {count} passwords to {filename}")
         
         elif choice == '5':
+            count = get_int_input("How many passwords? (1000000): ", 1_000_000)
+            length = get_int_input("Length (12): ", 12)
+            fmt = input("Format - lines/ndjson/csv (lines): ").strip().lower() or 'lines'
+            workers = get_int_input(f"Worker processes ({os.cpu_count() or 1}): ", os.cpu_count() or 1)
+            
+            try:
+                filename = gen.write_passwords(count, fmt=fmt, workers=workers, length=length)
+                print(f"Saved {count} passwords to {filename}")
+            except ValueError as e:
+                print(f"Error: {e}")
+        
+        elif choice == '6':
+            path = input("Password list (.txt) or index (.idx): ").strip()
+            try:
+                if not path.endswith('.idx'):
+                    print("Building index...")
+                    path = build_breach_index(path)
+                gen.breached = BreachIndex(path)
+                print(f"Loaded {len(gen.breached):,} breached passwords from {path}")
+            except (OSError, ValueError) as e:
+                print(f"Error: {e}")
+        
+        elif choice == '7':
             print("Goodbye!")
             break
         
@@ -1,8 +1,34 @@
+import os
 import re
 import json
 import string
-from collections import Counter
+import heapq
+import math
+import mmap
+import bisect
+import fnmatch
+import hashlib
+from array import array
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from itertools import repeat
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+CHUNK_SIZE = 1 << 20
+INDEX_CACHE_SIZE = 32
+TOP_CAPACITY = 1000
+HLL_PRECISION = 14
+LENGTH_PERCENTILES = {'p25': 25, 'median': 50, 'p75': 75, 'p90': 90, 'p99': 99}
+SENTENCE_END = re.compile(r'[.!?]')
+# One match per non-blank sentence: from its first visible character up to the next terminator
+SENTENCE_BODY = re.compile(r'[^.!?\s][^.!?]*')
+# Lowercase + strip punctuation in a single translate() for ASCII text
+ASCII_CLEAN = str.maketrans(string.ascii_uppercase, string.ascii_lowercase, string.punctuation)
 
 class TextAnalyzer:
     def __init__(self):
@@ -11,6 +37,8 @@ class TextAnalyzer:
             'of', 'with', 'by', 'is', 'are', 'was', 'were', 'have', 'has', 'had', 
             'this', 'that', 'it', 'you', 'i', 'he', 'she', 'we', 'they'
         }
+        self.cache_size = INDEX_CACHE_SIZE
+        self._index_cache = OrderedDict()
     
     def clean_text(self, text):
         return text.lower().translate(str.maketrans('', '', string.punctuation))
@@ -24,72 +52,552 @@ class TextAnalyzer:
         return words
     
     def analyze(self, text, options=None):
-        opts = options or {'min_length': 1, 'skip_common': False, 'top_words': 10}
-        words = self.get_words(text, opts.get('min_length', 1), opts.get('skip_common', False))
-        
-        if not words:
-            return self._empty_analysis(text)
-        
+        if options and options.get('approximate'):
+            return self.analyze_stream([text], options)
+        return self.index(text).stats(options)
+    
+    def index(self, text):
+        """Return the TextIndex for text, reusing a cached one for identical content."""
+        key = hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+        idx = self._index_cache.get(key)
+        if idx is not None:
+            self._index_cache.move_to_end(key)
+            return idx
+        idx = TextIndex(self, text)
+        self._index_cache[key] = idx
+        if len(self._index_cache) > self.cache_size:
+            self._index_cache.popitem(last=False)
+        return idx
+    
+    def count_words(self, text, min_len=1, skip_common=False):
+        """Return (Counter, total, summed length) of the words get_words() would yield.
+
+        Tokens are counted once and the filters are applied to the vocabulary,
+        so no filtered word lists are built.
+        """
+        if text.isascii():
+            words = text.translate(ASCII_CLEAN).split()
+        else:
+            words = self.clean_text(text).split()
         word_count = Counter(words)
         total_words = len(words)
-        unique_words = len(word_count)
-        avg_len = sum(len(w) for w in words) / total_words
+        del words
+        return self.filter_counts(word_count, total_words, min_len, skip_common)
+    
+    def filter_counts(self, word_count, total_words, min_len=1, skip_common=False):
+        if skip_common or min_len > 1:
+            stop = self.stop_words if skip_common else ()
+            word_count = Counter({w: c for w, c in word_count.items()
+                                  if len(w) >= min_len and w not in stop})
+            total_words = sum(word_count.values())
+        word_len_sum = sum(len(w) * c for w, c in word_count.items())
+        return word_count, total_words, word_len_sum
+    
+    def analyze_stream(self, chunks, options=None):
+        """Analyze an iterable of text chunks with memory bounded by the chunk size.
+
+        Words, sentences and paragraphs that straddle chunk edges are carried
+        over, so the result is identical to analyze() on the joined text.
+        With options['approximate'] the vocabulary is kept in fixed-size
+        sketches instead (see SpaceSaving and HyperLogLog).
+        """
+        opts = options or {'min_length': 1, 'skip_common': False, 'top_words': 10}
+        state = _AnalysisState.from_options(self, opts)
+        for chunk in chunks:
+            state.feed(chunk)
+        state.close()
+        return state.result(opts.get('top_words', 10))
+    
+    def analyze_path(self, path, options=None, chunk_size=CHUNK_SIZE):
+        return self.analyze_stream(mmap_chunks(path, chunk_size), options)
+    
+    def analyze_corpus(self, paths, options=None, workers=None, pattern='*', chunk_size=CHUNK_SIZE):
+        """Analyze many files across a process pool and merge the per-file totals.
+
+        paths is a directory (walked recursively, filtered by pattern) or a list
+        of file paths. Sentences and paragraphs never span two files.
+        """
+        opts = options or {'min_length': 1, 'skip_common': False, 'top_words': 10}
+        files = corpus_files(paths, pattern)
+        workers = workers or os.cpu_count() or 1
         
+        total = _AnalysisState.from_options(self, opts)
+        if workers == 1 or len(files) < 2:
+            states = map(_file_state, repeat(self), files, repeat(opts), repeat(chunk_size))
+            for state in states:
+                total.merge(state)
+        else:
+            batch = max(1, len(files) // (workers * 4))
+            # Workers only need the stop words, not this analyzer and its index cache
+            stop_words = frozenset(self.stop_words)
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                states = pool.map(_analyze_file, repeat(stop_words), files, repeat(opts),
+                                  repeat(chunk_size), chunksize=batch)
+                for state in states:
+                    total.merge(state)
+        return total.result(opts.get('top_words', 10))
+    
+    def _build_stats(self, chars, chars_no_space, total_words, word_len_sum,
+                     unique_words, sentences, paragraphs, top_words):
         return {
-            'chars': len(text),
-            'chars_no_space': len(text.replace(' ', '')),
+            'chars': chars,
+            'chars_no_space': chars_no_space,
             'words': total_words,
             'unique_words': unique_words,
-            'sentences': len([s for s in re.split(r'[.!?]+', text) if s.strip()]),
-            'paragraphs': len([p for p in text.split('\n\n') if p.strip()]),
-            'avg_word_len': round(avg_len, 2),
+            'sentences': sentences,
+            'paragraphs': paragraphs,
+            'avg_word_len': round(word_len_sum / total_words, 2),
             'reading_min': round(total_words / 200, 2),
             'diversity': round(unique_words / total_words, 3),
-            'top_words': word_count.most_common(opts.get('top_words', 10))
+            'top_words': top_words
         }
     
-    def _empty_analysis(self, text):
+    def _empty_analysis(self, chars, chars_no_space):
         return {
-            'chars': len(text), 'chars_no_space': len(text.replace(' ', '')),
+            'chars': chars, 'chars_no_space': chars_no_space,
             'words': 0, 'unique_words': 0, 'sentences': 0, 'paragraphs': 0,
             'avg_word_len': 0, 'reading_min': 0, 'diversity': 0, 'top_words': []
         }
     
     def find_word(self, text, word):
-        words = self.get_words(text)
-        count = words.count(word.lower())
-        total = len(words)
+        return self.index(text).find_word(word)
+    
+    def compare(self, text1, text2):
+        return self.index(text1).compare(self.index(text2))
+    
+    def word_lengths(self, text):
+        return self.index(text).word_lengths()
+    
+    def save(self, data, filename=None):
+        filename = filename or f"analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        with open(filename, 'w') as f:
+            json.dump({'analysis': data, 'created': datetime.now().isoformat()}, f, indent=2)
+        return filename
+
+class TextIndex:
+    """Word counts and cached stats for one document, built by a single tokenization.
+
+    Term positions are only collected when positions=True, since they cost
+    one integer per word.
+    """
+
+    def __init__(self, analyzer, text, positions=False):
+        self.analyzer = analyzer
+        self.word_count, self.total_words, self.word_len_sum = analyzer.count_words(text)
+        self.chars = len(text)
+        self.chars_no_space = len(text) - text.count(' ')
+        self.sentences = len(SENTENCE_BODY.findall(text))
+        self.paragraphs = sum(1 for p in text.split('\n\n') if p and not p.isspace())
+        self.positions = self._build_positions(text) if positions else None
+        self._stats = {}
+        self._ranked = None
+        self._lengths = None
+    
+    def _build_positions(self, text):
+        positions = {}
+        for i, word in enumerate(self.analyzer.get_words(text)):
+            positions.setdefault(word, array('L')).append(i)
+        return positions
+    
+    def count(self, word):
+        return self.word_count.get(word.lower(), 0)
+    
+    def find_word(self, word):
+        count = self.count(word)
+        total = self.total_words
         return {
             'word': word,
             'count': count,
             'percentage': round((count / total * 100) if total else 0, 2)
         }
     
-    def compare(self, text1, text2):
-        stats1, stats2 = self.analyze(text1), self.analyze(text2)
+    def occurrences(self, word, start=0, stop=None):
+        """Word positions of word in [start, stop), needs positions=True."""
+        if self.positions is None:
+            raise ValueError("Index was built without positions")
+        found = self.positions.get(word.lower(), ())
+        lo = bisect.bisect_left(found, start)
+        hi = len(found) if stop is None else bisect.bisect_left(found, stop)
+        return list(found[lo:hi])
+    
+    def top(self, n=10):
+        if self._ranked is None:
+            self._ranked = self.word_count.most_common()
+        return self._ranked[:n]
+    
+    def stats(self, options=None):
+        opts = options or {'min_length': 1, 'skip_common': False, 'top_words': 10}
+        key = (opts.get('min_length', 1), opts.get('skip_common', False), opts.get('top_words', 10))
+        if key not in self._stats:
+            self._stats[key] = self._compute_stats(*key)
+        return dict(self._stats[key])
+    
+    def _compute_stats(self, min_len, skip_common, top_n):
+        if min_len > 1 or skip_common:
+            word_count, total_words, word_len_sum = self.analyzer.filter_counts(
+                self.word_count, self.total_words, min_len, skip_common)
+            top_words = word_count.most_common(top_n)
+        else:
+            word_count, total_words, word_len_sum = self.word_count, self.total_words, self.word_len_sum
+            top_words = self.top(top_n)
+        
+        if not total_words:
+            return self.analyzer._empty_analysis(self.chars, self.chars_no_space)
+        return self.analyzer._build_stats(
+            self.chars, self.chars_no_space, total_words, word_len_sum,
+            len(word_count), self.sentences, self.paragraphs, top_words)
+    
+    def word_lengths(self):
+        if not self.total_words:
+            return {}
+        if self._lengths is None:
+            self._lengths = length_stats(length_histogram(self.word_count))
+        lengths = self._lengths
+        stats = {'min': lengths['min'], 'max': lengths['max'],
+                 'avg': round(self.word_len_sum / self.total_words, 2)}
+        stats.update((name, lengths[name]) for name in LENGTH_PERCENTILES)
+        stats['distribution'] = dict(lengths['distribution'])
+        return stats
+    
+    def compare(self, other):
+        stats1, stats2 = self.stats(), other.stats()
         return {
             key: {'text1': stats1[key], 'text2': stats2[key], 
                   'diff': stats2[key] - stats1[key] if isinstance(stats1[key], (int, float)) else 'N/A'}
             for key in stats1 if key != 'top_words'
         }
+
+class _AnalysisState:
+    """Running totals for TextAnalyzer.analyze_stream()."""
+
+    def __init__(self, analyzer, min_len=1, skip_common=False, top=None, distinct=None):
+        self.analyzer = analyzer
+        self.min_len = min_len
+        self.skip_common = skip_common
+        self.word_count = Counter()
+        self.top = top
+        self.distinct = distinct
+        self.chars = 0
+        self.chars_no_space = 0
+        self.words = 0
+        self.word_len_sum = 0
+        self.sentences = 0
+        self.paragraphs = 0
+        self._word_tail = ''
+        self._para_tail = ''
+        self._in_sentence = False
+        self._in_paragraph = False
     
-    def word_lengths(self, text):
-        lengths = [len(w) for w in self.get_words(text)]
-        if not lengths:
-            return {}
+    def __getstate__(self):
+        # Sent back from worker processes without the analyzer: merge() only needs the totals
+        state = self.__dict__.copy()
+        state['analyzer'] = None
+        return state
+    
+    @classmethod
+    def from_options(cls, analyzer, opts):
+        top = distinct = None
+        if opts.get('approximate'):
+            top = SpaceSaving(opts.get('top_capacity', TOP_CAPACITY))
+            distinct = HyperLogLog(opts.get('hll_precision', HLL_PRECISION))
+        return cls(analyzer, opts.get('min_length', 1), opts.get('skip_common', False), top, distinct)
+    
+    def feed(self, chunk):
+        if not chunk:
+            return
+        self.chars += len(chunk)
+        self.chars_no_space += len(chunk) - chunk.count(' ')
+        self._feed_words(chunk)
+        self._feed_sentences(chunk)
+        self._feed_paragraphs(chunk)
+    
+    def close(self):
+        if self._word_tail:
+            self._add_words(self._word_tail)
+            self._word_tail = ''
+        self._in_sentence = False
+        if self._in_paragraph:
+            self.paragraphs += 1
+            self._in_paragraph = False
+        self._para_tail = ''
+    
+    def merge(self, other):
+        """Fold in the totals of another closed state (e.g. from a worker process)."""
+        if self.top is not None:
+            self.top.merge(other.top)
+            self.distinct.merge(other.distinct)
+        else:
+            self.word_count.update(other.word_count)
+        self.chars += other.chars
+        self.chars_no_space += other.chars_no_space
+        self.words += other.words
+        self.word_len_sum += other.word_len_sum
+        self.sentences += other.sentences
+        self.paragraphs += other.paragraphs
+        return self
+    
+    def result(self, top_n=10):
+        if not self.words:
+            return self.analyzer._empty_analysis(self.chars, self.chars_no_space)
+        if self.top is None:
+            return self.analyzer._build_stats(
+                self.chars, self.chars_no_space, self.words, self.word_len_sum,
+                len(self.word_count), self.sentences, self.paragraphs,
+                self.word_count.most_common(top_n)
+            )
         
-        return {
-            'min': min(lengths),
-            'max': max(lengths),
-            'avg': round(sum(lengths) / len(lengths), 2),
-            'distribution': dict(sorted(Counter(lengths).items()))
+        unique_words = min(round(self.distinct.estimate()), self.words)
+        stats = self.analyzer._build_stats(
+            self.chars, self.chars_no_space, self.words, self.word_len_sum,
+            unique_words, self.sentences, self.paragraphs, self.top.most_common(top_n)
+        )
+        stats['error_bounds'] = {
+            'unique_words': round(self.distinct.relative_error(), 4),
+            'top_words': self.top.max_error()
         }
+        return stats
     
-    def save(self, data, filename=None):
-        filename = filename or f"analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(filename, 'w') as f:
-            json.dump({'analysis': data, 'created': datetime.now().isoformat()}, f, indent=2)
-        return filename
+    def _feed_words(self, chunk):
+        # Only whole words are cleaned; the trailing partial word waits for the next chunk
+        text = self._word_tail + chunk
+        if text[-1].isspace():
+            self._word_tail = ''
+        else:
+            self._word_tail = text.rsplit(None, 1)[-1]
+            text = text[:-len(self._word_tail)]
+        self._add_words(text)
+    
+    def _add_words(self, text):
+        word_count, total_words, word_len_sum = self.analyzer.count_words(
+            text, self.min_len, self.skip_common)
+        self.words += total_words
+        self.word_len_sum += word_len_sum
+        if self.top is not None:
+            self.top.update(word_count)
+            self.distinct.update(word_count)
+        else:
+            self.word_count.update(word_count)
+    
+    def _feed_sentences(self, chunk):
+        # Sentences are counted when they start; _in_sentence marks one still open
+        self.sentences += len(SENTENCE_BODY.findall(chunk))
+        first = SENTENCE_END.search(chunk)
+        head = chunk[:first.start()] if first else chunk
+        if self._in_sentence and head and not head.isspace():
+            self.sentences -= 1
+        if first:
+            tail = chunk[max(chunk.rfind('.'), chunk.rfind('!'), chunk.rfind('?')) + 1:]
+            self._in_sentence = bool(tail) and not tail.isspace()
+        else:
+            self._in_sentence = self._in_sentence or (bool(head) and not head.isspace())
+    
+    def _feed_paragraphs(self, chunk):
+        # A lone trailing newline may pair with a leading one in the next chunk
+        parts = (self._para_tail + chunk).split('\n\n')
+        for part in parts[:-1]:
+            if self._in_paragraph or (part and not part.isspace()):
+                self.paragraphs += 1
+            self._in_paragraph = False
+        last = parts[-1]
+        self._in_paragraph = self._in_paragraph or (bool(last) and not last.isspace())
+        self._para_tail = '\n' if last.endswith('\n') else ''
+
+class SpaceSaving:
+    """Approximate top-k counter (Metwally et al.) holding at most capacity words.
+
+    A reported count overestimates the true one by at most max_error(),
+    which is bounded by total / capacity.
+    """
+
+    def __init__(self, capacity=TOP_CAPACITY):
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+        self._heap = []
+    
+    def add(self, word, count=1):
+        if word in self.counts:
+            self.counts[word] += count
+        elif len(self.counts) < self.capacity:
+            self.counts[word] = count
+            self.errors[word] = 0
+        else:
+            floor, victim = self._pop_min()
+            del self.counts[victim], self.errors[victim]
+            self.counts[word] = floor + count
+            self.errors[word] = floor
+        heapq.heappush(self._heap, (self.counts[word], word))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(c, w) for w, c in self.counts.items()]
+            heapq.heapify(self._heap)
+    
+    def update(self, word_count):
+        for word, count in word_count.items():
+            self.add(word, count)
+    
+    def _pop_min(self):
+        # Heap entries go stale when a count grows; skip them lazily
+        while True:
+            count, word = heapq.heappop(self._heap)
+            if self.counts.get(word) == count:
+                return count, word
+    
+    def min_count(self):
+        if len(self.counts) < self.capacity:
+            return 0
+        return min(self.counts.values())
+    
+    def max_error(self):
+        return max(self.errors.values(), default=0)
+    
+    def merge(self, other):
+        """Combine two summaries (Agarwal et al. mergeable summaries)."""
+        floor_a, floor_b = self.min_count(), other.min_count()
+        counts, errors = {}, {}
+        for word in self.counts.keys() | other.counts.keys():
+            counts[word] = self.counts.get(word, floor_a) + other.counts.get(word, floor_b)
+            errors[word] = self.errors.get(word, floor_a) + other.errors.get(word, floor_b)
+        keep = heapq.nlargest(self.capacity, counts.items(), key=lambda item: item[1])
+        self.counts = dict(keep)
+        self.errors = {w: errors[w] for w in self.counts}
+        self._heap = [(c, w) for w, c in self.counts.items()]
+        heapq.heapify(self._heap)
+        return self
+    
+    def most_common(self, n=10):
+        return sorted(self.counts.items(), key=lambda item: item[1], reverse=True)[:n]
+
+class HyperLogLog:
+    """Distinct-word estimator using 2**precision one-byte registers."""
+
+    def __init__(self, precision=HLL_PRECISION):
+        if not 4 <= precision <= 18:
+            raise ValueError("HyperLogLog precision must be between 4 and 18")
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+    
+    def add(self, word):
+        h = int.from_bytes(hashlib.blake2b(word.encode('utf-8', 'surrogatepass'), digest_size=8).digest(), 'big')
+        bits = 64 - self.precision
+        idx = h >> bits
+        rank = bits - (h & ((1 << bits) - 1)).bit_length() + 1
+        if rank > self.registers[idx]:
+            self.registers[idx] = rank
+    
+    def update(self, words):
+        for word in words:
+            self.add(word)
+    
+    def merge(self, other):
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches of different precision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+    
+    def estimate(self):
+        m = len(self.registers)
+        alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(m, 0.7213 / (1 + 1.079 / m))
+        raw = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            return m * math.log(m / zeros)
+        return raw
+    
+    def relative_error(self):
+        return 1.04 / math.sqrt(len(self.registers))
+
+def length_histogram(word_count):
+    """Return hist with hist[n] = number of words of n characters.
+
+    The vocabulary is encoded once as length/count arrays; with NumPy the
+    histogram is a single bincount, otherwise an array('Q') is filled in.
+    """
+    if not word_count:
+        return []
+    if np is not None:
+        lengths = np.fromiter(map(len, word_count), dtype=np.int64, count=len(word_count))
+        counts = np.fromiter(word_count.values(), dtype=np.int64, count=len(word_count))
+        # Weighted bincount sums in float64, exact for any count below 2**53
+        return np.bincount(lengths, weights=counts).astype(np.int64).tolist()
+    # 'Q', not 'H': minified or base64 text can hold a token of 65,536+ characters
+    lengths = array('Q', map(len, word_count))
+    hist = array('Q', bytes(8 * (max(lengths) + 1)))
+    for length, count in zip(lengths, word_count.values()):
+        hist[length] += count
+    return hist.tolist()
+
+def length_stats(hist):
+    """min/max/nearest-rank percentiles and distribution from a length histogram."""
+    distribution = {n: c for n, c in enumerate(hist) if c}
+    total = sum(distribution.values())
+    stats = {'min': next(iter(distribution)), 'max': next(reversed(distribution))}
+    
+    ranks = sorted((-(-total * q // 100), name) for name, q in LENGTH_PERCENTILES.items())
+    seen, i = 0, 0
+    for length, count in distribution.items():
+        seen += count
+        while i < len(ranks) and ranks[i][0] <= seen:
+            stats[ranks[i][1]] = length
+            i += 1
+    stats['distribution'] = distribution
+    return stats
+
+def _file_state(analyzer, path, opts, chunk_size):
+    state = _AnalysisState.from_options(analyzer, opts)
+    for chunk in mmap_chunks(path, chunk_size):
+        state.feed(chunk)
+    state.close()
+    return state
+
+_worker_analyzer = None
+
+def _analyze_file(stop_words, path, opts, chunk_size):
+    # One analyzer per worker process, rebuilt only if the stop words change
+    global _worker_analyzer
+    if _worker_analyzer is None or _worker_analyzer.stop_words != stop_words:
+        _worker_analyzer = TextAnalyzer()
+        _worker_analyzer.stop_words = set(stop_words)
+    return _file_state(_worker_analyzer, path, opts, chunk_size)
+
+def mmap_chunks(path, chunk_size=CHUNK_SIZE):
+    """Yield the UTF-8 text of path in windows of about chunk_size bytes.
+
+    The file is memory-mapped, so only one decoded window is alive at a time
+    and the page cache serves the reads. Windows never split a UTF-8 sequence
+    or a CRLF pair, and newlines are translated like open() in text mode.
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            size = len(mm)
+            pos = 0
+            while pos < size:
+                limit = end = min(pos + max(chunk_size, 4), size)
+                # A UTF-8 sequence has at most 3 continuation bytes after its lead byte
+                while end < size and end > limit - 3 and mm[end] & 0xC0 == 0x80:
+                    end -= 1
+                if end < size and mm[end] & 0xC0 == 0x80:
+                    end = limit  # not UTF-8: let decode() below raise like open() would
+                if end < size and end - 1 > pos and mm[end - 1] == 0x0D:
+                    end -= 1
+                data = mm[pos:end]
+                text = data.decode('ascii') if data.isascii() else data.decode('utf-8')
+                if '\r' in text:
+                    text = text.replace('\r\n', '\n').replace('\r', '\n')
+                yield text
+                pos = end
+
+def corpus_files(paths, pattern='*'):
+    if isinstance(paths, str):
+        if not os.path.isdir(paths):
+            return [paths]
+        found = []
+        for root, dirs, names in os.walk(paths):
+            dirs.sort()
+            found.extend(os.path.join(root, n) for n in sorted(names) if fnmatch.fnmatch(n, pattern))
+        return found
+    return list(paths)
 
 def load_file(path):
     try:
@@ -145,7 +653,8 @@ def main():
     
     menu = {
         '1': 'Analyze text', '2': 'Analyze file', '3': 'Compare texts',
-        '4': 'Find word', '5': 'Word lengths', '6': 'Custom options', '7': 'Exit'
+        '4': 'Find word', '5': 'Word lengths', '6': 'Custom options',
+        '7': 'Analyze folder', '8': 'Exit'
     }
     
     while True:
@@ -159,9 +668,12 @@ def main():
         
         elif choice == '2':
             path = input("File path: ")
-            text = load_file(path)
-            if text:
-                results = analyzer.analyze(text)
+            try:
+                results = analyzer.analyze_path(path)
+            except Exception as e:
+                print(f"Error: {e}")
+                results = None
+            if results and results['chars']:
                 show_results(results)
                 if input("\nSave results? (y/N): ").lower() == 'y':
                     print(f"Saved to {analyzer.save(results)}")
@@ -189,6 +701,7 @@ def main():
                     print(f"\nWord Length Analysis:")
                     print(f"Range: {stats['min']}-{stats['max']} chars")
                     print(f"Average: {stats['avg']} chars")
+                    print(f"Median: {stats['median']} chars (p90: {stats['p90']})")
                     print("Distribution:")
                     for length, count in stats['distribution'].items():
                         print(f"  {length}: {count}")
@@ -204,6 +717,19 @@ def main():
                 show_results(analyzer.analyze(text, options))
         
         elif choice == '7':
+            folder = input("Folder path: ")
+            pattern = input("File pattern (*.txt): ") or "*.txt"
+            try:
+                results = analyzer.analyze_corpus(folder, pattern=pattern)
+            except Exception as e:
+                print(f"Error: {e}")
+                results = None
+            if results and results['chars']:
+                show_results(results)
+                if input("\nSave results? (y/N): ").lower() == 'y':
+                    print(f"Saved to {analyzer.save(results)}")
+        
+        elif choice == '8':
             print("Goodbye!")
             break
         
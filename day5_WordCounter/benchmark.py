@@ -0,0 +1,95 @@
+import os
+import re
+import sys
+import time
+import random
+import resource
+import subprocess
+import tempfile
+from collections import Counter
+
+from WordCounter import TextAnalyzer, load_file
+
+WORDS = ("the quick brown fox jumps over lazy dog while we analyze text "
+         "streams Python counter analysis paragraph sentence").split()
+
+def make_text(size_mb, seed=42):
+    rng = random.Random(seed)
+    parts, size = [], 0
+    while size < size_mb * 1024 * 1024:
+        sentence = ' '.join(rng.choices(WORDS, k=rng.randint(5, 20))).capitalize()
+        sentence += rng.choice(['. ', '! ', '? ', '.\n\n'])
+        parts.append(sentence)
+        size += len(sentence)
+    return ''.join(parts)
+
+def legacy_analyze(analyzer, text, top_n=10):
+    # The multi-pass analyze() this module used before the fused tokenizer
+    words = analyzer.get_words(text)
+    word_count = Counter(words)
+    return {
+        'chars': len(text),
+        'chars_no_space': len(text.replace(' ', '')),
+        'words': len(words),
+        'unique_words': len(word_count),
+        'sentences': len([s for s in re.split(r'[.!?]+', text) if s.strip()]),
+        'paragraphs': len([p for p in text.split('\n\n') if p.strip()]),
+        'avg_word_len': round(sum(len(w) for w in words) / len(words), 2),
+        'top_words': word_count.most_common(top_n)
+    }
+
+def timed(label, func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed:8.3f}s")
+    return result, elapsed
+
+def bench_tokenizer(size_mb):
+    analyzer = TextAnalyzer()
+    print(f"Generating {size_mb} MB of text...")
+    text = make_text(size_mb)
+
+    old, old_time = timed("legacy multi-pass analyze", legacy_analyze, analyzer, text)
+    new, new_time = timed("fused analyze", analyzer.analyze, text)
+    for key in old:
+        assert old[key] == new[key], key
+    print(f"Speedup: {old_time / new_time:.2f}x")
+
+def run_file_mode(mode, path):
+    # Runs in a child process so ru_maxrss only covers this one analysis
+    analyzer = TextAnalyzer()
+    start = time.perf_counter()
+    if mode == 'load':
+        analyzer.analyze(load_file(path))
+    else:
+        analyzer.analyze_path(path)
+    elapsed = time.perf_counter() - start
+    print(f"{elapsed} {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}")
+
+def bench_file(size_mb):
+    print(f"Writing {size_mb} MB test file...")
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False, encoding='utf-8') as f:
+        f.write(make_text(size_mb))
+        path = f.name
+    try:
+        for mode, label in [('load', 'load_file + analyze'), ('mmap', 'mmap analyze_path')]:
+            out = subprocess.run([sys.executable, __file__, '_file', mode, path],
+                                 capture_output=True, text=True, check=True).stdout.split()
+            print(f"{label:<28} {float(out[0]):8.3f}s  peak RSS {int(out[1]) / 1024:8.1f} MB")
+    finally:
+        os.remove(path)
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '_file':
+        return run_file_mode(sys.argv[2], sys.argv[3])
+    
+    mode = sys.argv[1] if len(sys.argv) > 1 else 'tokenize'
+    size_mb = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    if mode == 'file':
+        bench_file(size_mb)
+    else:
+        bench_tokenizer(size_mb)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import tempfile
+import threading
+import subprocess
+
+import day7_todolist
+from day7_todolist import TodoManager
+
+def timed(label, count, func):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<34} {elapsed:8.3f}s  {count / elapsed:14,.0f} ops/sec")
+
+class LegacyTasks:
+    # The list-backed operations TodoManager used before the id index
+    def __init__(self):
+        self.tasks = []
+    
+    def add_task(self, description):
+        self.tasks.append({'id': len(self.tasks) + 1, 'description': description, 'completed': False})
+    
+    def complete_task(self, task_id):
+        for task in self.tasks:
+            if task['id'] == task_id:
+                task['completed'] = True
+                return
+    
+    def delete_task(self, task_id):
+        for i, task in enumerate(self.tasks):
+            if task['id'] == task_id:
+                self.tasks.pop(i)
+                return
+
+def bench(count, ops):
+    rng = random.Random(3)
+    legacy = LegacyTasks()
+    # Only the in-memory operations are compared; saving is measured by the 'save' mode
+    todo = TodoManager(write_behind=True, flush_interval=3600, flush_every=10**9)
+    
+    print(f"{count:,} tasks")
+    timed("legacy add", count, lambda: [legacy.add_task(f"task {i}") for i in range(count)])
+    timed("indexed add", count, lambda: [todo.add_task(f"task {i}", quiet=True) for i in range(count)])
+    
+    legacy_ops = min(ops, 200)
+    ids = rng.sample(range(1, count + 1), ops)
+    timed(f"legacy complete ({legacy_ops:,})", legacy_ops,
+          lambda: [legacy.complete_task(i) for i in ids[:legacy_ops]])
+    timed(f"indexed complete ({ops:,})", ops, lambda: [todo.complete_task(i, quiet=True) for i in ids])
+    timed(f"indexed lookup ({ops:,})", ops, lambda: [todo.get_task(i) for i in ids])
+    timed(f"legacy delete ({legacy_ops:,})", legacy_ops,
+          lambda: [legacy.delete_task(i) for i in ids[:legacy_ops]])
+    timed(f"indexed delete ({ops:,})", ops, lambda: [todo.delete_task(i, quiet=True) for i in ids])
+    
+    # Ids keep counting up after deletions instead of reusing len(tasks) + 1
+    task = todo.add_task("after deletions", quiet=True)
+    assert task['id'] == count + 1 and len(todo.tasks) == count - ops + 1
+    todo.close()
+
+def legacy_saves(count):
+    # What every add_task used to do: rewrite tasks.json with indent=2
+    tasks = []
+    for i in range(count):
+        tasks.append({'id': i + 1, 'description': f"task {i}", 'completed': False})
+        with open('legacy.json', 'w') as f:
+            json.dump(tasks, f, indent=2)
+
+def bench_save(count):
+    legacy = min(count, 2_000)
+    timed(f"save per add ({legacy:,})", legacy, lambda: legacy_saves(legacy))
+    
+    def write_behind():
+        todo = TodoManager('behind.json', write_behind=True)
+        for i in range(count):
+            todo.add_task(f"task {i}", quiet=True)
+        todo.close()
+    timed(f"write-behind add_task ({count:,})", count, write_behind)
+    
+    def bulk():
+        todo = TodoManager('bulk.json', write_behind=True)
+        todo.add_tasks(f"task {i}" for i in range(count))
+        todo.close()
+    timed(f"add_tasks ({count:,})", count, bulk)
+    assert len(TodoManager('behind.json').tasks) == len(TodoManager('bulk.json').tasks) == count
+
+def make_descriptions(count, seed=5):
+    rng = random.Random(seed)
+    verbs = ["buy", "call", "email", "fix", "review", "plan", "clean", "book", "pay", "write"]
+    nouns = [f"{a}{b}" for a in ("pro", "con", "re", "de", "in", "sub", "ex", "pre") for b in
+             ("ject", "tract", "port", "form", "sign", "cord", "pose", "duct", "vert", "mit")]
+    places = [f"site{i}" for i in range(2000)]
+    for i in range(count):
+        yield f"{rng.choice(verbs)} {rng.choice(nouns)} {rng.choice(nouns)} at {rng.choice(places)}"
+
+def bench_search(count):
+    todo = TodoManager('search.json', write_behind=True, flush_interval=3600)
+    timed(f"add_tasks + index ({count:,})", count, lambda: todo.add_tasks(make_descriptions(count)))
+    rng = random.Random(9)
+    for task_id in rng.sample(range(1, count + 1), count // 2):
+        todo.complete_task(task_id, quiet=True)
+    todo.close()
+    timed("load + rebuild index", count, lambda: TodoManager('search.json'))
+    
+    tasks = list(todo.tasks.values())
+    def legacy_search(text):
+        # A scan like list_tasks did, one page of matches at the end
+        terms = text.lower().split()
+        matches = [t for t in tasks if not t['completed'] and all(w in t['description'].lower().split() for w in terms)]
+        return matches[:20]
+    
+    queries = ["site1234", "fix site77", "review project", "proj*", "sub* site12*", "buy"]
+    for text in queries:
+        start = time.perf_counter()
+        result = todo.search(text, status='pending')
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"search {text!r:<18} pending {result['total']:>8,} hits  {elapsed:8.2f} ms")
+    start = time.perf_counter()
+    legacy_search("fix site77")
+    print(f"legacy scan 'fix site77'           {(time.perf_counter() - start) * 1000:8.2f} ms")
+    
+    for page in (1, 1000, count // 2 // 20):
+        start = time.perf_counter()
+        todo.query('pending', page)
+        print(f"pending page {page:<8,}               {(time.perf_counter() - start) * 1000:8.2f} ms")
+    start = time.perf_counter()
+    [t for t in tasks if not t['completed']]
+    print(f"legacy pending list                  {(time.perf_counter() - start) * 1000:8.2f} ms")
+
+def bench_schedule(count):
+    rng = random.Random(12)
+    todo = TodoManager('schedule.json', write_behind=True, flush_interval=3600, flush_every=10**9)
+    days = [f"2026-{m:02d}-{d:02d}" for m in range(1, 13) for d in range(1, 29)]
+    def add_all():
+        for i in range(count):
+            todo.add_task(f"task {i}", quiet=True, priority=rng.randint(1, 3),
+                          due=rng.choice(days) if i % 4 else None)
+    timed(f"add with priority/due ({count:,})", count, add_all)
+    for task_id in rng.sample(range(1, count + 1), count // 2):
+        todo.complete_task(task_id, quiet=True)
+    today = "2026-01-15"
+    
+    def ms(label, func):
+        start = time.perf_counter()
+        result = func()
+        print(f"{label:<34} {(time.perf_counter() - start) * 1000:9.2f} ms")
+        return result
+    
+    tasks = list(todo.tasks.values())
+    ms("sort-based next task", lambda: min((t for t in tasks if not t['completed']),
+                                           key=lambda t: (t['priority'], t['due'] or "9999")))
+    # Half the tasks just completed, so the first query rebuilds the heaps without their dead entries
+    ms("first query, rebuilds heaps", todo.next_task)
+    ms("heap next task", todo.next_task)
+    ms("sort-based top 10 due soon", lambda: sorted((t for t in tasks if not t['completed'] and t['due']),
+                                                    key=lambda t: t['due'])[:10])
+    ms("heap top 10 due soon", lambda: todo.due_soon(10))
+    overdue = ms("heap overdue", lambda: todo.overdue_tasks(today))
+    print(f"  ({len(overdue):,} overdue tasks)")
+    
+    ids = [t['id'] for t in rng.sample(tasks, 10_000) if not t['completed']]
+    timed(f"complete + next ({len(ids):,})", len(ids),
+          lambda: [(todo.complete_task(i, quiet=True), todo.next_task()) for i in ids])
+    todo.close()
+
+def make_script(count, lines, seed=8):
+    rng = random.Random(seed)
+    ids = list(range(1, count + 1))
+    rng.shuffle(ids)
+    script = []
+    for i in range(lines):
+        if i % 4 == 0:
+            script.append(f"done {ids.pop()}")
+        elif i % 4 == 1:
+            script.append(f"delete {ids.pop()}")
+        elif i % 4 == 2:
+            script.append(f"add script task {i} !{rng.randint(1, 3)}")
+        else:
+            # '@name' and '!word' are part of the description, only trailing options are parsed
+            script.append(f"add reply to @alice about  !urgent task {i} @2030-01-0{rng.randint(1, 9)}")
+    return "\n".join(script) + "\n"
+
+def bench_script(count, lines):
+    # No timer: saves below happen only when asked for, like in the asyncio loop
+    todo = TodoManager('seed.json', write_behind=True, flush_interval=None)
+    todo.add_tasks(make_descriptions(count))
+    todo.flush()
+    script = make_script(count, lines)
+    program = day7_todolist.__file__
+    for label, args, stdin in [("startup + load, no commands", ["--script", "-"], ""),
+                               ("interactive loop", [], script + "quit\n"),
+                               ("asyncio loop", ["--async"], script + "quit\n"),
+                               ("--script (one transaction)", ["--script", "-"], script)]:
+        shutil.copy('seed.json', 'tasks.json')
+        start = time.perf_counter()
+        subprocess.run([sys.executable, program] + args, input=stdin, text=True,
+                       stdout=subprocess.DEVNULL, check=True)
+        elapsed = time.perf_counter() - start
+        print(f"{label:<34} {elapsed:8.3f}s" + (f"  {lines / elapsed:14,.0f} lines/sec" if stdin else ""))
+    replies = [t for t in TodoManager('tasks.json', flush_interval=None).tasks.values()
+               if t['description'].startswith("reply to @alice about  !urgent task")]
+    assert len(replies) == lines // 4 and all(t['due'] for t in replies)
+    
+    # How long a change waits while a save of the whole list is running on another thread
+    start = time.perf_counter()
+    todo.save_tasks()
+    print(f"save {count:,} tasks                   {(time.perf_counter() - start) * 1000:9.2f} ms")
+    todo.add_task("make a change", quiet=True)
+    saver = threading.Thread(target=todo.flush)
+    saver.start()
+    start = time.perf_counter()
+    todo.add_task("change during a save", quiet=True)
+    print(f"add during background save          {(time.perf_counter() - start) * 1000:9.2f} ms")
+    saver.join()
+    todo.close()
+
+def main():
+    mode = sys.argv[1] if len(sys.argv) > 1 else 'ops'
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else {'ops': 1_000_000, 'search': 300_000, 'schedule': 1_000_000,
+                                                               'script': 200_000}.get(mode, 100_000)
+    ops = int(sys.argv[3]) if len(sys.argv) > 3 else 100_000
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        if mode == 'save':
+            bench_save(count)
+        elif mode == 'search':
+            bench_search(count)
+        elif mode == 'schedule':
+            bench_schedule(count)
+        elif mode == 'script':
+            bench_script(count, ops if len(sys.argv) > 3 else 20_000)
+        else:
+            bench(count, ops)
+
+if __name__ == "__main__":
+    main()
@@ -5,65 +5,523 @@ Simple To-Do List Manager - Easy to understand version
 
 import json
 import os
+import re
+import sys
+import atexit
+import asyncio
+import bisect
+import concurrent.futures
+import contextlib
+import datetime
+import heapq
+import itertools
+import queue
+import threading
 
-class TodoManager:
+FLUSH_INTERVAL = 2.0  # seconds a change may wait before write-behind saves it
+FLUSH_EVERY = 1000    # unsaved changes that force a save
+SAVE_DELAY = 0.2      # seconds the asyncio loop lets changes gather before a background save
+PAGE_SIZE = 20        # tasks shown per page by list and search
+DEFAULT_PRIORITY = 2  # 1 = high, 2 = normal, 3 = low
+NO_DUE = "9999-12-31" # sorts after every real due date
+
+WORD = re.compile(r"\w+")
+
+def words(text):
+    """Lowercase search words in a description or query"""
+    return WORD.findall(text.lower())
+
+class Bitset:
+    """Set of task ids stored one bit per id in a bytearray"""
+    
+    CHUNK = 4096  # bytes whose bits are counted at once when skipping to a page
+    
+    def __init__(self):
+        self.bits = bytearray()
+        self.count = 0
+    
+    def add(self, i):
+        byte, mask = i >> 3, 1 << (i & 7)
+        if byte >= len(self.bits):
+            self.bits.extend(bytes(byte - len(self.bits) + 1 + len(self.bits) // 2))
+        if not self.bits[byte] & mask:
+            self.bits[byte] |= mask
+            self.count += 1
+    
+    def discard(self, i):
+        byte, mask = i >> 3, 1 << (i & 7)
+        if byte < len(self.bits) and self.bits[byte] & mask:
+            self.bits[byte] &= ~mask
+            self.count -= 1
+    
+    def __contains__(self, i):
+        byte = i >> 3
+        return byte < len(self.bits) and bool(self.bits[byte] >> (i & 7) & 1)
+    
+    def __len__(self):
+        return self.count
+    
+    def filter(self, ids):
+        """The ids that are in the set"""
+        bits, size = self.bits, len(self.bits) * 8
+        return [i for i in ids if i < size and bits[i >> 3] >> (i & 7) & 1]
+    
+    def page(self, offset, size):
+        """Up to size ids in increasing order, skipping the first offset of them"""
+        result = []
+        bits = self.bits
+        for start in range(0, len(bits), self.CHUNK):
+            chunk = bits[start:start + self.CHUNK]
+            ones = int.from_bytes(chunk, 'little').bit_count()
+            if offset >= ones:
+                offset -= ones  # the whole chunk is before the page
+                continue
+            for j, byte in enumerate(chunk, start):
+                while byte:
+                    low = byte & -byte
+                    if offset:
+                        offset -= 1
+                    else:
+                        result.append(j * 8 + low.bit_length() - 1)
+                        if len(result) == size:
+                            return result
+                    byte ^= low
+        return result
+
+class TaskIndex:
+    """Inverted index from description words to task ids, plus pending/completed bitsets
+    
+    Updated on every add, complete and delete, so searches never scan the tasks.
+    Prefix searches bisect a sorted copy of the vocabulary; words added since it
+    was sorted wait in a small set and are merged in once there are enough.
+    """
+    
     def __init__(self):
-        self.tasks = []
+        self.postings = {}  # word -> set of task ids
+        self.pending = Bitset()
+        self.completed = Bitset()
+        self._sorted_words = []
+        self._new_words = set()
+    
+    def add(self, task):
+        task_id = task['id']
+        for word in set(words(task['description'])):
+            ids = self.postings.get(word)
+            if ids is None:
+                ids = self.postings[word] = set()
+                self._new_words.add(word)
+            ids.add(task_id)
+        (self.completed if task['completed'] else self.pending).add(task_id)
+    
+    def remove(self, task):
+        task_id = task['id']
+        for word in set(words(task['description'])):
+            ids = self.postings[word]
+            ids.discard(task_id)
+            if not ids:
+                # Left in _sorted_words until the next merge; lookups skip it
+                del self.postings[word]
+                self._new_words.discard(word)
+        self.pending.discard(task_id)
+        self.completed.discard(task_id)
+    
+    def complete(self, task_id):
+        self.pending.discard(task_id)
+        self.completed.add(task_id)
+    
+    def _prefixed(self, prefix):
+        """Words in the index starting with prefix"""
+        if len(self._new_words) > max(1024, len(self._sorted_words) // 8):
+            # Mostly sorted already, so this merge is close to linear
+            self._sorted_words = sorted(w for w in self._sorted_words + list(self._new_words)
+                                        if w in self.postings)
+            self._new_words = set()
+        found = [w for w in self._new_words if w.startswith(prefix)]
+        i = bisect.bisect_left(self._sorted_words, prefix)
+        while i < len(self._sorted_words) and self._sorted_words[i].startswith(prefix):
+            if self._sorted_words[i] in self.postings:
+                found.append(self._sorted_words[i])
+            i += 1
+        return found
+    
+    def match(self, query):
+        """Ids of tasks containing every query word; a word ending in * matches as a prefix"""
+        sets = []
+        for term in query.split():
+            term_words = words(term)
+            for n, word in enumerate(term_words):
+                if term.endswith('*') and n == len(term_words) - 1:
+                    ids = set().union(*(self.postings[w] for w in self._prefixed(word)))
+                else:
+                    ids = self.postings.get(word, set())
+                sets.append(ids)
+        if not sets:
+            return set()
+        sets.sort(key=len)
+        return sets[0].intersection(*sets[1:])
+
+def priority_key(task):
+    return (task.get('priority', DEFAULT_PRIORITY), task.get('due') or NO_DUE, task['id'])
+
+def due_key(task):
+    return (task['due'], task.get('priority', DEFAULT_PRIORITY), task['id'])
+
+class TaskScheduler:
+    """Pending tasks in two heaps: by priority then due date, and by due date alone
+    
+    Completing, deleting or rescheduling a task leaves its old heap entries in
+    place (lazy deletion). Each entry carries the task's version at push time,
+    so it is live only while the task is pending and has not been pushed again;
+    dead entries are skipped or popped when reached, and both heaps are rebuilt
+    once dead entries outnumber live ones.
+    """
+    
+    def __init__(self, tasks):
+        self.tasks = tasks  # the manager's id -> task dict
+        self.rebuild()
+    
+    def rebuild(self):
+        self.versions = {}
+        self.by_priority = []
+        self.by_due = []
+        for task in self.tasks.values():
+            if not task['completed']:
+                self.versions[task['id']] = 0
+                self.by_priority.append(priority_key(task) + (0,))
+                if task.get('due'):
+                    self.by_due.append(due_key(task) + (0,))
+        heapq.heapify(self.by_priority)
+        heapq.heapify(self.by_due)
+        self.live = len(self.by_priority) + len(self.by_due)
+        self.needs_rebuild = False
+    
+    def push(self, task):
+        version = self.versions.get(task['id'], -1) + 1
+        self.versions[task['id']] = version
+        heapq.heappush(self.by_priority, priority_key(task) + (version,))
+        self.live += 1
+        if task.get('due'):
+            heapq.heappush(self.by_due, due_key(task) + (version,))
+            self.live += 1
+    
+    def discard(self, task):
+        """Call before a pending task is completed, deleted or given a new priority/due date"""
+        self.versions[task['id']] += 1
+        self.live -= 2 if task.get('due') else 1
+        if len(self.by_priority) + len(self.by_due) > 2 * self.live + 64:
+            self.needs_rebuild = True  # on the next query, once the task has changed
+    
+    def _task(self, entry):
+        """The entry's task if the entry is live, else None"""
+        task_id, version = entry[-2], entry[-1]
+        if self.versions.get(task_id) != version:
+            return None
+        task = self.tasks.get(task_id)
+        return task if task is not None and not task['completed'] else None
+    
+    def _clean(self):
+        if self.needs_rebuild:
+            self.rebuild()
+    
+    def next_task(self):
+        """The pending task with the highest priority, earliest due first"""
+        self._clean()
+        heap = self.by_priority
+        while heap and self._task(heap[0]) is None:
+            heapq.heappop(heap)
+        return self._task(heap[0]) if heap else None
+    
+    def _in_order(self, heap):
+        """Yield live tasks in heap order without popping, by walking the heap as a tree"""
+        frontier = [(heap[0], 0)] if heap else []
+        while frontier:
+            entry, i = heapq.heappop(frontier)
+            task = self._task(entry)
+            if task is not None:
+                yield task
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child], child))
+    
+    def due_soon(self, k):
+        """The k pending tasks due first"""
+        self._clean()
+        return list(itertools.islice(self._in_order(self.by_due), k))
+    
+    def overdue(self, today=None):
+        """Pending tasks due before today, oldest first"""
+        self._clean()
+        today = today or datetime.date.today().isoformat()
+        return list(itertools.takewhile(lambda task: task['due'] < today, self._in_order(self.by_due)))
+
+def paginate(ids, total, page, page_size):
+    """Sorted ids for one page, picking the cheaper of a partial heap or a full sort"""
+    offset = (page - 1) * page_size
+    if offset + page_size < total // 16:
+        return heapq.nsmallest(offset + page_size, ids)[offset:]
+    return sorted(ids)[offset:offset + page_size]
+
+class TodoManager:
+    def __init__(self, filename='tasks.json', write_behind=False,
+                 flush_interval=FLUSH_INTERVAL, flush_every=FLUSH_EVERY):
+        self.filename = filename
+        self.tasks = {}  # id -> task, in the order they were added
+        self.next_id = 1
+        # With write_behind, changes are saved in batches instead of one file rewrite each
+        self.write_behind = write_behind
+        self.flush_interval = flush_interval
+        self.flush_every = flush_every
+        self.unsaved = 0
+        self._lock = threading.RLock()       # guards unsaved and the timer
+        self._save_lock = threading.Lock()   # one file write at a time
+        self._timer = None
+        self._in_transaction = False
+        self.index = TaskIndex()
+        self.scheduler = TaskScheduler(self.tasks)
         self.load_tasks()
+        if write_behind:
+            atexit.register(self.flush)
     
     def load_tasks(self):
-        """Load tasks from file if it exists"""
-        if os.path.exists('tasks.json'):
-            try:
-                with open('tasks.json', 'r') as f:
-                    self.tasks = json.load(f)
-            except:
-                self.tasks = []
+        """Load tasks from file if it exists
+        
+        A damaged file raises instead of loading as an empty list, which the
+        next save would write over the real tasks.
+        """
+        data = {'tasks': []}
+        if os.path.exists(self.filename):
+            with open(self.filename, 'r') as f:
+                data = json.load(f)
+            # Older files are a plain list of tasks with no id counter
+            if isinstance(data, list):
+                data = {'tasks': data}
+        # Ids are never reused, even when the newest task was deleted
+        self.next_id = max(data.get('next_id', 1), max((task['id'] for task in data['tasks']), default=0) + 1)
+        self.tasks = {}
+        for task in data['tasks']:
+            # Older versions numbered tasks len(tasks) + 1, which could hand out an id twice
+            if task['id'] in self.tasks:
+                task['id'] = self.next_id
+                self.next_id += 1
+            self.tasks[task['id']] = task
+        for task in self.tasks.values():
+            # Every task gets all its keys up front: a background save may be
+            # reading a task while it is changed, which is fine for values but
+            # not for keys being added
+            task.setdefault('priority', DEFAULT_PRIORITY)
+            task.setdefault('due', None)
+        self.index = TaskIndex()
+        for task in self.tasks.values():
+            self.index.add(task)
+        self.scheduler = TaskScheduler(self.tasks)
     
     def save_tasks(self):
-        """Save tasks to file"""
-        with open('tasks.json', 'w') as f:
-            json.dump(self.tasks, f, indent=2)
+        """Save all tasks now, as compact JSON swapped in with an atomic rename
+        
+        Only taking the snapshot holds _lock, so changes can go on while
+        another thread writes the file.
+        """
+        with self._save_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                self.unsaved = 0
+                data = {'next_id': self.next_id, 'tasks': list(self.tasks.values())}
+            tmp = self.filename + '.tmp'
+            # json.dumps encodes in one C call, several times faster than streaming json.dump
+            text = json.dumps(data, separators=(',', ':'))
+            with open(tmp, 'w') as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.filename)
+    
+    def flush(self):
+        """Save now if there are unsaved changes, unless a transaction is still open"""
+        if self.unsaved and not self._in_transaction:
+            self.save_tasks()
+    
+    def close(self):
+        """Save pending changes; call before exiting"""
+        self.flush()
+    
+    @contextlib.contextmanager
+    def transaction(self):
+        """Group changes so they are saved once at the end, or all undone if one fails
+        
+        Pending write-behind changes are saved first, so undoing is just
+        reloading the file.
+        """
+        self.flush()
+        self._in_transaction = True
+        try:
+            yield self
+        except BaseException:
+            self._in_transaction = False
+            self.unsaved = 0
+            self.load_tasks()
+            raise
+        self._in_transaction = False
+        self.flush()
+    
+    def _changed(self, count=1):
+        """Save after a change, or in write-behind mode once enough changes or time have piled up"""
+        if self._in_transaction:
+            self.unsaved += count
+            return
+        if not self.write_behind:
+            self.save_tasks()
+            return
+        with self._lock:
+            self.unsaved += count
+            # Waiting for as many changes as there are tasks keeps rewrites amortized O(1) per change
+            full = self.unsaved >= max(self.flush_every, len(self.tasks))
+            # flush_interval=None leaves the saving to the caller, as the asyncio loop does
+            if not full and self._timer is None and self.flush_interval is not None:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if full:
+            self.save_tasks()
+    
+    def get_task(self, task_id):
+        """Return the task with this id, or None"""
+        return self.tasks.get(task_id)
     
-    def add_task(self, description):
-        """Add a new task"""
+    def add_task(self, description, quiet=False, priority=DEFAULT_PRIORITY, due=None):
+        """Add a new task; due is an ISO date (YYYY-MM-DD) or None"""
         if description.strip():
             task = {
-                'id': len(self.tasks) + 1,
+                'id': self.next_id,
                 'description': description.strip(),
-                'completed': False
+                'completed': False,
+                'priority': priority,
+                'due': due
             }
-            self.tasks.append(task)
-            self.save_tasks()
-            print(f"✅ Added: {description}")
+            self.next_id += 1
+            self.tasks[task['id']] = task
+            self.index.add(task)
+            self.scheduler.push(task)
+            self._changed()
+            if not quiet:
+                print(f"✅ Added: {describe(task)}")
+            return task
         else:
             print("❌ Task description cannot be empty!")
     
-    def complete_task(self, task_id):
+    def add_tasks(self, descriptions):
+        """Add many tasks with a single save; blank descriptions are skipped"""
+        added = []
+        for description in descriptions:
+            description = description.strip()
+            if description:
+                task = {'id': self.next_id, 'description': description, 'completed': False,
+                        'priority': DEFAULT_PRIORITY, 'due': None}
+                self.next_id += 1
+                self.tasks[task['id']] = task
+                self.index.add(task)
+                self.scheduler.push(task)
+                added.append(task)
+        if added:
+            self._changed(len(added))
+        return added
+    
+    def complete_task(self, task_id, quiet=False):
         """Mark task as completed"""
-        for task in self.tasks:
-            if task['id'] == task_id:
-                if not task['completed']:
-                    task['completed'] = True
-                    self.save_tasks()
-                    print(f"✅ Completed: {task['description']}")
-                else:
-                    print("❌ Task already completed!")
-                return
-        print("❌ Task not found!")
+        task = self.tasks.get(task_id)
+        if task is None:
+            print("❌ Task not found!")
+        elif not task['completed']:
+            self.scheduler.discard(task)
+            task['completed'] = True
+            self.index.complete(task_id)
+            self._changed()
+            if not quiet:
+                print(f"✅ Completed: {task['description']}")
+            return True
+        else:
+            print("❌ Task already completed!")
+        return False
     
-    def delete_task(self, task_id):
+    def delete_task(self, task_id, quiet=False):
         """Delete a task"""
-        for i, task in enumerate(self.tasks):
-            if task['id'] == task_id:
-                deleted_task = self.tasks.pop(i)
-                self.save_tasks()
-                print(f"🗑️ Deleted: {deleted_task['description']}")
-                return
-        print("❌ Task not found!")
+        deleted_task = self.tasks.pop(task_id, None)
+        if deleted_task is None:
+            print("❌ Task not found!")
+            return False
+        self.index.remove(deleted_task)
+        if not deleted_task['completed']:
+            self.scheduler.discard(deleted_task)
+        self._changed()
+        if not quiet:
+            print(f"🗑️ Deleted: {deleted_task['description']}")
+        return True
+    
+    def schedule_task(self, task_id, priority=None, due=None, quiet=False):
+        """Change a task's priority and/or due date (ISO date, or '' to clear it)"""
+        task = self.tasks.get(task_id)
+        if task is None:
+            print("❌ Task not found!")
+            return False
+        new_priority = task.get('priority', DEFAULT_PRIORITY) if priority is None else priority
+        new_due = task.get('due') if due is None else (due or None)
+        if (new_priority, new_due) != (task.get('priority', DEFAULT_PRIORITY), task.get('due')):
+            if not task['completed']:
+                self.scheduler.discard(task)
+            task['priority'], task['due'] = new_priority, new_due
+            if not task['completed']:
+                self.scheduler.push(task)
+            self._changed()
+        if not quiet:
+            print(f"📅 Planned: {describe(task)}")
+        return True
+    
+    def next_task(self):
+        """The pending task to do next: highest priority, then earliest due date"""
+        return self.scheduler.next_task()
+    
+    def overdue_tasks(self, today=None):
+        """Pending tasks whose due date is before today, oldest first"""
+        return self.scheduler.overdue(today)
+    
+    def due_soon(self, k=5):
+        """The k pending tasks with the nearest due dates"""
+        return self.scheduler.due_soon(k)
+    
+    def query(self, status=None, page=1, page_size=PAGE_SIZE):
+        """One page of tasks in id order; status is None, 'pending' or 'completed'
+        
+        Returns a dict with the page's tasks, the total number of matches, and
+        the page number and page count.
+        """
+        if status is None:
+            total = len(self.tasks)
+            offset = (page - 1) * page_size
+            ids = list(itertools.islice(self.tasks, offset, offset + page_size))
+        else:
+            bitset = self.index.pending if status == 'pending' else self.index.completed
+            total = len(bitset)
+            ids = bitset.page((page - 1) * page_size, page_size)
+        return self._page(ids, total, page, page_size)
+    
+    def search(self, text, status=None, page=1, page_size=PAGE_SIZE):
+        """One page of tasks whose description has every word of text (word* for prefixes)"""
+        ids = self.index.match(text)
+        if status is not None:
+            ids = (self.index.pending if status == 'pending' else self.index.completed).filter(ids)
+        return self._page(paginate(ids, len(ids), page, page_size), len(ids), page, page_size)
     
-    def list_tasks(self):
-        """Show all tasks"""
+    def _page(self, ids, total, page, page_size):
+        return {
+            'tasks': [self.tasks[i] for i in ids],
+            'total': total,
+            'page': page,
+            'pages': max(1, -(-total // page_size))
+        }
+    
+    def list_tasks(self, status=None, page=1):
+        """Show tasks a page at a time, pending first"""
         if not self.tasks:
             print("📝 No tasks yet! Add some tasks to get started.")
             return
@@ -71,81 +529,387 @@ class TodoManager:
         print("\n📋 YOUR TO-DO LIST:")
         print("-" * 40)
         
-        pending = [t for t in self.tasks if not t['completed']]
-        completed = [t for t in self.tasks if t['completed']]
-        
-        if pending:
-            print("⏳ PENDING:")
-            for task in pending:
-                print(f"  {task['id']}. {task['description']}")
+        shown = False
+        if status in (None, 'pending'):
+            pending = self.query('pending', page)
+            if pending['tasks']:
+                print("⏳ PENDING:")
+                show_page(pending)
+                shown = True
         
-        if completed:
-            print("✅ COMPLETED:")
-            for task in completed:
-                print(f"  {task['id']}. {task['description']}")
+        if status in (None, 'completed'):
+            completed = self.query('completed', page)
+            if completed['tasks']:
+                print("✅ COMPLETED:")
+                show_page(completed)
+                shown = True
         
+        if not shown:
+            print("No more tasks.")
         print("-" * 40)
 
+def describe(task):
+    """Task description with its priority and due date, when they are set"""
+    details = []
+    priority = task.get('priority', DEFAULT_PRIORITY)
+    if priority != DEFAULT_PRIORITY:
+        details.append(f"!{priority}")
+    if task.get('due'):
+        details.append(f"due {task['due']}")
+    return f"{task['description']} ({', '.join(details)})" if details else task['description']
+
+# A trailing '!1'..'!3', '@YYYY-MM-DD' or '@-' word; anything else is part of the text
+OPTION = re.compile(r"(?:^|\s)(!\d|@\d{4}-\d{2}-\d{2}|@-)\s*$")
+
+def parse_options(text):
+    """Split trailing '!<priority>' and '@<YYYY-MM-DD>' words off a command's text
+    
+    Returns (remaining text, priority or None, due date or None); '@-' means no due date.
+    Other words, like '@alice' or '!important', stay in the text with their spacing.
+    Raises ValueError for a bad priority or date.
+    """
+    text, priority, due = text.strip(), None, None
+    match = OPTION.search(text)
+    while match:
+        word = match.group(1)
+        # Read right to left, so the last priority or date given wins
+        if word.startswith('!'):
+            if priority is None:
+                priority = int(word[1:])
+                if not 1 <= priority <= 3:
+                    raise ValueError("priority must be 1 (high) to 3 (low)")
+        elif due is None:
+            due = '' if word == '@-' else datetime.date.fromisoformat(word[1:]).isoformat()
+        text = text[:match.start()].rstrip()
+        match = OPTION.search(text)
+    return text, priority, due
+
+def show_tasks(tasks, empty):
+    if not tasks:
+        print(empty)
+    for task in tasks:
+        print(f"  {task['id']}. {describe(task)}")
+
+def show_page(result, marks=False):
+    """Print one page of tasks and where it is in the results"""
+    for task in result['tasks']:
+        mark = ("✅ " if task['completed'] else "⏳ ") if marks else ""
+        print(f"  {mark}{task['id']}. {describe(task)}")
+    if not result['tasks']:
+        print("  No more tasks.")
+    elif result['pages'] > 1:
+        hint = " - type 'more' for the next page" if result['page'] < result['pages'] else ""
+        print(f"  Page {result['page']}/{result['pages']} ({result['total']} tasks){hint}")
+
 def show_help():
     """Show available commands"""
     print("\n🎯 COMMANDS:")
-    print("  add <task>       - Add new task")
-    print("  list             - Show all tasks")
+    print("  add <task> [!1-3] [@YYYY-MM-DD] - Add new task with optional priority and due date")
+    print("  list [pending|done] [page] - Show tasks a page at a time")
+    print("  search <words>   - Find tasks with all the words (word* = prefix)")
+    print("  more             - Next page of the last list or search")
     print("  done <id>        - Mark task as completed")
     print("  delete <id>      - Delete task")
+    print("  plan <id> [!1-3] [@YYYY-MM-DD|@-] - Change priority or due date")
+    print("  next             - Show the task to do next")
+    print("  overdue          - Show pending tasks past their due date")
+    print("  soon [k]         - Show the k tasks due soonest (default 5)")
     print("  help             - Show this help")
     print("  quit             - Exit program\n")
 
+
+SCRIPT_COMMANDS = ('add', 'done', 'delete', 'plan')
+
+def parse_script(lines):
+    """Parse a script of add/done/delete/plan lines before any of it runs
+    
+    Blank lines and lines starting with '#' are skipped. Returns
+    (commands, errors): commands are (line number, command, arguments)
+    tuples and errors are messages for the lines that could not be parsed.
+    """
+    commands, errors = [], []
+    for number, line in enumerate(lines, 1):
+        parts = line.strip().split(' ', 1)
+        command = parts[0].lower()
+        if not command or command.startswith('#'):
+            continue
+        text = parts[1] if len(parts) > 1 else ''
+        try:
+            if command == 'add':
+                description, priority, due = parse_options(text)
+                if not description:
+                    raise ValueError("task description cannot be empty")
+                commands.append((number, command, (description, priority or DEFAULT_PRIORITY, due or None)))
+            elif command == 'plan':
+                task_id, priority, due = parse_options(text)
+                if not task_id.isdigit():
+                    raise ValueError("usage: plan <id> [!1-3] [@YYYY-MM-DD|@-]")
+                commands.append((number, command, (int(task_id), priority, due)))
+            elif command in ('done', 'delete'):
+                if not text.strip().isdigit():
+                    raise ValueError(f"usage: {command} <id>")
+                commands.append((number, command, (int(text),)))
+            else:
+                raise ValueError(f"unknown command '{command}' (scripts can use {', '.join(SCRIPT_COMMANDS)})")
+        except ValueError as e:
+            errors.append(f"line {number}: {e}")
+    return commands, errors
+
+def run_script(todo, lines):
+    """Apply a whole script as one transaction, saved once; returns True if it was applied
+    
+    Any bad line, or a done/delete/plan of a missing task, leaves the tasks unchanged.
+    """
+    commands, errors = parse_script(lines)
+    counts = dict.fromkeys(SCRIPT_COMMANDS, 0)
+    try:
+        if errors:
+            raise ValueError('\n❌ '.join(errors))
+        with todo.transaction():
+            for number, command, args in commands:
+                if command == 'add':
+                    todo.add_task(args[0], quiet=True, priority=args[1], due=args[2])
+                else:
+                    task = todo.get_task(args[0])
+                    if task is None:
+                        raise ValueError(f"line {number}: task {args[0]} not found")
+                    if command == 'done':
+                        if task['completed']:
+                            raise ValueError(f"line {number}: task {args[0]} is already completed")
+                        todo.complete_task(args[0], quiet=True)
+                    elif command == 'delete':
+                        todo.delete_task(args[0], quiet=True)
+                    else:
+                        todo.schedule_task(*args, quiet=True)
+                counts[command] += 1
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        print("❌ Script not applied, no tasks were changed.")
+        return False
+    print(f"✅ Applied {len(commands)} commands: {counts['add']} added, {counts['done']} completed, "
+          f"{counts['delete']} deleted, {counts['plan']} planned")
+    return True
+
+def run_command(todo, user_input, view):
+    """Run one command line; returns False when the user wants to quit
+    
+    view remembers the last list or search so 'more' can continue it.
+    """
+    parts = user_input.strip().split(' ', 1)
+    command = parts[0].lower()
+    
+    if not command:
+        pass
+    
+    elif command == 'quit' or command == 'exit':
+        return False
+    
+    elif command == 'help':
+        show_help()
+    
+    elif command == 'list':
+        args = parts[1].split() if len(parts) > 1 else []
+        status = {'pending': 'pending', 'done': 'completed', 'completed': 'completed'}.get(
+            args[0].lower()) if args else None
+        page = int(args[-1]) if args and args[-1].isdigit() else 1
+        view['show'], view['page'] = (lambda p, status=status: todo.list_tasks(status, p)), page
+        view['show'](page)
+    
+    elif command == 'search' and len(parts) > 1:
+        def show_search(page, text=parts[1]):
+            result = todo.search(text, page=page)
+            if not result['total']:
+                print("🔍 No matching tasks.")
+                return
+            print(f"\n🔍 {result['total']} matching tasks:")
+            show_page(result, marks=True)
+        view['show'], view['page'] = show_search, 1
+        show_search(1)
+    
+    elif command == 'more':
+        if view.get('show') is None:
+            print("❌ Nothing to continue. Use 'list' or 'search' first.")
+        else:
+            view['page'] += 1
+            view['show'](view['page'])
+    
+    elif command == 'add' and len(parts) > 1:
+        try:
+            description, priority, due = parse_options(parts[1])
+            todo.add_task(description, priority=priority or DEFAULT_PRIORITY, due=due or None)
+        except ValueError as e:
+            print(f"❌ {e}")
+    
+    elif command == 'plan' and len(parts) > 1:
+        try:
+            task_id, priority, due = parse_options(parts[1])
+            task_id = int(task_id)
+        except ValueError:
+            print("❌ Usage: plan <id> [!1-3] [@YYYY-MM-DD|@-]")
+        else:
+            todo.schedule_task(task_id, priority, due)
+    
+    elif command == 'next':
+        task = todo.next_task()
+        print(f"👉 Next: {task['id']}. {describe(task)}" if task else "🎉 Nothing pending!")
+    
+    elif command == 'overdue':
+        print("\n⏰ OVERDUE:")
+        show_tasks(todo.overdue_tasks(), "  Nothing overdue.")
+    
+    elif command == 'soon':
+        k = int(parts[1]) if len(parts) > 1 and parts[1].strip().isdigit() else 5
+        print("\n📅 DUE SOON:")
+        show_tasks(todo.due_soon(k), "  No tasks with due dates.")
+    
+    elif command == 'done' and len(parts) > 1:
+        try:
+            task_id = int(parts[1])
+            todo.complete_task(task_id)
+        except ValueError:
+            print("❌ Please enter a valid task ID number")
+    
+    elif command == 'delete' and len(parts) > 1:
+        try:
+            task_id = int(parts[1])
+            todo.delete_task(task_id)
+        except ValueError:
+            print("❌ Please enter a valid task ID number")
+    
+    else:
+        print("❌ Invalid command. Type 'help' for available commands.")
+    
+    return True
+
+def start_reader(loop):
+    """Start a reader thread; returns read_line(prompt), a future for the next line
+    
+    input() runs on a daemon thread, so the event loop keeps running while
+    it waits and Ctrl+C doesn't have to wait for Enter. The future gives
+    None at the end of input.
+    """
+    requests = queue.Queue()
+    
+    def read():
+        while True:
+            prompt, line = requests.get()
+            try:
+                result = input(prompt)
+            except EOFError:
+                result = None
+            loop.call_soon_threadsafe(line.set_result, result)
+    
+    def read_line(prompt):
+        line = loop.create_future()
+        requests.put((prompt, line))
+        return line
+    
+    threading.Thread(target=read, daemon=True).start()
+    return read_line
+
+async def main_async(todo):
+    """The command loop with saving moved to a background thread
+    
+    A change wakes the saver, which lets more changes gather for SAVE_DELAY
+    and then writes the file in an executor while the prompt carries on.
+    Changes made during a save are picked up by the next one, so saves
+    never pile up behind a fast typist or a pasted list.
+    """
+    loop = asyncio.get_running_loop()
+    changed, stopping = asyncio.Event(), asyncio.Event()
+    
+    async def autosave():
+        delay = SAVE_DELAY
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as saver:
+            while True:
+                await changed.wait()
+                if not stopping.is_set():
+                    await asyncio.sleep(delay)
+                changed.clear()
+                start = loop.time()
+                try:
+                    await loop.run_in_executor(saver, todo.flush)
+                except OSError as e:
+                    print(f"\n❌ Could not save tasks: {e}")
+                # Encoding a big list holds the GIL, so saves are spaced out to
+                # leave the prompt at least 80% of the time
+                delay = max(SAVE_DELAY, 4 * (loop.time() - start))
+                if stopping.is_set() and not changed.is_set():
+                    return
+    
+    saving = asyncio.create_task(autosave())
+    read_line = start_reader(loop)
+    view = {}
+    while True:
+        user_input = await read_line("📝 Enter command: ")
+        if user_input is None or not run_command(todo, user_input, view):
+            break
+        if todo.unsaved:
+            changed.set()
+    stopping.set()
+    changed.set()
+    await saving
+
 def main():
-    """Main program loop"""
-    todo = TodoManager()
+    """Main program loop
+    
+    python day7_todolist.py                  interactive prompt
+    python day7_todolist.py --async          prompt that saves in the background
+    python day7_todolist.py --script FILE    apply a file of add/done/delete/plan lines ('-' reads stdin)
+    """
+    args = sys.argv[1:]
+    use_async = '--async' in args
+    script = None
+    if '--script' in args:
+        position = args.index('--script') + 1
+        if position >= len(args):
+            print("❌ Usage: day7_todolist.py --script <file or ->")
+            sys.exit(2)
+        script = args[position]
+    
+    try:
+        # The asyncio loop does its own saving, so it needs no write-behind timer
+        todo = TodoManager(write_behind=True, flush_interval=None if use_async else FLUSH_INTERVAL)
+    except (OSError, ValueError) as e:
+        print(f"❌ Could not load tasks: {e}")
+        sys.exit(1)
+    
+    if script is not None:
+        try:
+            if script == '-':
+                lines = sys.stdin.read().splitlines()
+            else:
+                with open(script, 'r') as f:
+                    lines = f.read().splitlines()
+        except OSError as e:
+            print(f"❌ Could not read script: {e}")
+            sys.exit(1)
+        if not run_script(todo, lines):
+            sys.exit(1)
+        return
     
     print("🎯 Simple To-Do Manager")
     print("Type 'help' to see commands\n")
     
+    if use_async:
+        try:
+            asyncio.run(main_async(todo))
+        except KeyboardInterrupt:
+            print()
+        todo.close()
+        print("👋 Goodbye!")
+        return
+    
+    view = {}  # what 'more' continues
     while True:
         try:
-            user_input = input("📝 Enter command: ").strip()
-            
-            if not user_input:
-                continue
-            
-            parts = user_input.split(' ', 1)
-            command = parts[0].lower()
-            
-            if command == 'quit' or command == 'exit':
-                print("👋 Goodbye!")
+            if not run_command(todo, input("📝 Enter command: "), view):
                 break
-            
-            elif command == 'help':
-                show_help()
-            
-            elif command == 'list':
-                todo.list_tasks()
-            
-            elif command == 'add' and len(parts) > 1:
-                todo.add_task(parts[1])
-            
-            elif command == 'done' and len(parts) > 1:
-                try:
-                    task_id = int(parts[1])
-                    todo.complete_task(task_id)
-                except ValueError:
-                    print("❌ Please enter a valid task ID number")
-            
-            elif command == 'delete' and len(parts) > 1:
-                try:
-                    task_id = int(parts[1])
-                    todo.delete_task(task_id)
-                except ValueError:
-                    print("❌ Please enter a valid task ID number")
-            
-            else:
-                print("❌ Invalid command. Type 'help' for available commands.")
-        
-        except KeyboardInterrupt:
-            print("\n👋 Goodbye!")
+        except (KeyboardInterrupt, EOFError):
+            print()
             break
+    todo.close()
+    print("👋 Goodbye!")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
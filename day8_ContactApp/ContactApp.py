@@ -1,8 +1,206 @@
 # Simple Contact Book for Python Beginners
 # Uses only basic concepts: variables, lists, dictionaries, functions, loops
 
-# Store contacts in a list of dictionaries
-contacts = []
+import os
+import re
+import marshal
+import secrets
+import sqlite3
+
+DB_FILE = "contacts.db"  # contacts are saved here between runs
+
+def name_key(name):
+    """Name as it is looked up: case and extra spaces don't matter"""
+    return " ".join(name.casefold().split())
+
+def phone_key(phone):
+    """Phone as it is looked up: only the digits matter"""
+    return re.sub(r"\D", "", phone)
+
+class ContactBook:
+    """Contacts saved in SQLite, with dictionaries for instant exact lookups
+    
+    Only the two indexes live in memory; names and phones are read from
+    the database by id when they are shown. Every change bumps a counter in
+    the database, so a book notices when another program changed it and
+    reloads. The indexes are saved to <filename>.index on close, tagged
+    with the database's random id and counter, so the next start loads
+    them in one go instead of rebuilding them.
+    """
+    def __init__(self, filename=DB_FILE):
+        self.db = sqlite3.connect(filename)
+        with self.db:
+            self.db.execute("CREATE TABLE IF NOT EXISTS contacts (id INTEGER PRIMARY KEY, name TEXT NOT NULL, "
+                            "phone TEXT NOT NULL, name_key TEXT NOT NULL, phone_key TEXT NOT NULL)")
+            self.db.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            self.db.execute("INSERT OR IGNORE INTO meta VALUES ('version', 0)")
+            self.db.execute("INSERT OR IGNORE INTO meta VALUES ('db_id', ?)", (secrets.randbits(62),))
+        self.db_id = self.db.execute("SELECT value FROM meta WHERE name = 'db_id'").fetchone()[0]
+        self.index_file = filename + ".index"
+        self.by_name = {}   # name_key -> id, or a list of ids when several contacts share it
+        self.by_phone = {}  # phone_key -> id, or a list of ids
+        self.count = 0
+        self.version = 0    # bumped by every change, in the same transaction
+        self.load()
+    
+    def __len__(self):
+        self._sync()
+        return self.count
+    
+    def _db_version(self):
+        return self.db.execute("SELECT value FROM meta WHERE name = 'version'").fetchone()[0]
+    
+    def _sync(self):
+        # Another program may have changed the database since we last looked
+        if self._db_version() != self.version:
+            self.load()
+    
+    def load(self):
+        """Load the saved indexes, or rebuild them if they don't match the database"""
+        self.version = self._db_version()
+        try:
+            with open(self.index_file, "rb") as f:
+                # One read and loads() is much faster than load() pulling the file in small pieces
+                db_id, version, count, by_name, by_phone = marshal.loads(f.read())
+            if (db_id, version) == (self.db_id, self.version):
+                self.count, self.by_name, self.by_phone = count, by_name, by_phone
+                return
+        except (OSError, EOFError, ValueError, TypeError):
+            pass  # missing or unreadable: rebuild below
+        rows = self.db.execute("SELECT id, name_key, phone_key FROM contacts ORDER BY id").fetchall()
+        ids, name_keys, phone_keys = zip(*rows) if rows else ((), (), ())
+        self.count = len(ids)
+        self.by_name = self._build_index(ids, name_keys)
+        self.by_phone = self._build_index(ids, phone_keys)
+    
+    def save_index(self):
+        """Save the indexes for a fast next start, unless another program changed the database"""
+        if self._db_version() != self.version:
+            return
+        tmp = self.index_file + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(marshal.dumps((self.db_id, self.version, self.count, self.by_name, self.by_phone)))
+        os.replace(tmp, self.index_file)
+    
+    @staticmethod
+    def _build_index(ids, keys):
+        # dict(zip()) runs in C; only keys shared by several contacts need a loop
+        index = dict(zip(keys, ids))
+        if len(index) < len(keys):
+            first = dict(zip(reversed(keys), reversed(ids)))
+            shared = {key for key, contact_id in index.items() if first[key] != contact_id}
+            for key in shared:
+                index[key] = []
+            for contact_id, key in zip(ids, keys):
+                if key in shared:
+                    index[key].append(contact_id)
+        return index
+    
+    @staticmethod
+    def _index(index, key, contact_id):
+        # Most keys belong to one contact, so a bare id saves a list per contact
+        found = index.get(key)
+        if found is None:
+            index[key] = contact_id
+        elif isinstance(found, list):
+            found.append(contact_id)
+        else:
+            index[key] = [found, contact_id]
+    
+    @staticmethod
+    def _unindex(index, key, contact_id):
+        found = index.get(key)
+        if isinstance(found, list):
+            if contact_id in found:
+                found.remove(contact_id)
+            if len(found) == 1:
+                index[key] = found[0]
+        elif found == contact_id:
+            del index[key]
+    
+    def _ids(self, index, key):
+        found = index.get(key)
+        if found is None:
+            return []
+        return list(found) if isinstance(found, list) else [found]
+    
+    def _changed(self):
+        """Bump the change counter; call inside the transaction that makes the change
+        
+        Returns True when another program changed the database since this
+        book last looked, so the indexes must be reloaded, not patched.
+        """
+        self.db.execute("UPDATE meta SET value = value + 1 WHERE name = 'version'")
+        version = self._db_version()
+        stale = version != self.version + 1
+        self.version = version
+        return stale
+    
+    def add(self, name, phone):
+        """Save a new contact and return its id"""
+        return self.add_many([(name, phone)])[0]
+    
+    def add_many(self, pairs):
+        """Save many (name, phone) contacts in one transaction; returns their ids"""
+        contacts = [(name, phone, name_key(name), phone_key(phone)) for name, phone in pairs]
+        with self.db:
+            # Taking the write lock before reading MAX(id) keeps ids unique with other programs
+            self.db.execute("BEGIN IMMEDIATE")
+            first_id = (self.db.execute("SELECT MAX(id) FROM contacts").fetchone()[0] or 0) + 1
+            rows = [(first_id + i,) + contact for i, contact in enumerate(contacts)]
+            self.db.executemany("INSERT INTO contacts VALUES (?, ?, ?, ?, ?)", rows)
+            stale = self._changed()
+        if stale:
+            self.load()
+            return [row[0] for row in rows]
+        self.count += len(rows)
+        for contact_id, _, _, key, digits in rows:
+            self._index(self.by_name, key, contact_id)
+            self._index(self.by_phone, digits, contact_id)
+        return [row[0] for row in rows]
+    
+    def delete(self, contact_id):
+        """Delete a contact; returns its (name, phone), or None if there is no such id"""
+        with self.db:
+            self.db.execute("BEGIN IMMEDIATE")
+            row = self.db.execute("SELECT name, phone, name_key, phone_key FROM contacts WHERE id = ?",
+                                  (contact_id,)).fetchone()
+            if row is None:
+                return None
+            self.db.execute("DELETE FROM contacts WHERE id = ?", (contact_id,))
+            stale = self._changed()
+        if stale:
+            self.load()
+            return row[0], row[1]
+        self.count -= 1
+        self._unindex(self.by_name, row[2], contact_id)
+        self._unindex(self.by_phone, row[3], contact_id)
+        return row[0], row[1]
+    
+    def find(self, text):
+        """Contacts whose name or phone number matches text exactly, as (id, name, phone)"""
+        self._sync()
+        ids = set(self._ids(self.by_name, name_key(text)))
+        digits = phone_key(text)
+        if digits:
+            ids.update(self._ids(self.by_phone, digits))
+        if not ids:
+            return []
+        marks = ", ".join("?" * len(ids))
+        return self.db.execute(f"SELECT id, name, phone FROM contacts WHERE id IN ({marks}) ORDER BY id",
+                               list(ids)).fetchall()
+    
+    def all(self):
+        """Every contact as (id, name, phone), in the order they were added"""
+        return self.db.execute("SELECT id, name, phone FROM contacts ORDER BY id")
+    
+    def close(self):
+        """Save the indexes and close the database"""
+        try:
+            self.save_index()
+        except OSError as e:
+            print(f"Could not save the contact index: {e}")
+        self.db.close()
 
 def show_menu():
     """Display the main menu"""
@@ -16,67 +214,61 @@ def show_menu():
     print("5. Exit")
     print("="*30)
 
-def add_contact():
+def add_contact(book):
     """Add a new contact"""
     print("\n--- Add New Contact ---")
     
-    name = input("Enter name: ")
-    phone = input("Enter phone: ")
+    name = input("Enter name: ").strip()
+    phone = input("Enter phone: ").strip()
     
-    # Create a dictionary for this contact
-    new_contact = {
-        "name": name,
-        "phone": phone
-    }
+    if not name:
+        print("Name cannot be empty!")
+        return
     
-    # Add to our list
-    contacts.append(new_contact)
+    # Saved to the file right away
+    book.add(name, phone)
     print(f"Added {name} to contacts!")
 
-def show_all_contacts():
+def show_all_contacts(book):
     """Show all contacts"""
-    if len(contacts) == 0:
+    if len(book) == 0:
         print("\nNo contacts found!")
         return
     
     print("\n--- All Contacts ---")
-    for i in range(len(contacts)):
-        contact = contacts[i]
-        print(f"{i+1}. {contact['name']} - {contact['phone']}")
+    for contact_id, name, phone in book.all():
+        print(f"{contact_id}. {name} - {phone}")
 
-def search_contact():
-    """Search for a contact by name"""
-    if len(contacts) == 0:
+def search_contact(book):
+    """Search for a contact by name or phone number"""
+    if len(book) == 0:
         print("\nNo contacts to search!")
         return
     
-    search_name = input("\nEnter name to search: ")
+    search_text = input("\nEnter name or phone to search: ")
     
-    found = False
-    for contact in contacts:
-        if contact["name"].lower() == search_name.lower():
-            print(f"\nFound: {contact['name']} - {contact['phone']}")
-            found = True
-            break
+    found = book.find(search_text)
+    for contact_id, name, phone in found:
+        print(f"\nFound: {name} - {phone}")
     
     if not found:
-        print(f"Contact '{search_name}' not found!")
+        print(f"Contact '{search_text}' not found!")
 
-def delete_contact():
+def delete_contact(book):
     """Delete a contact"""
-    if len(contacts) == 0:
+    if len(book) == 0:
         print("\nNo contacts to delete!")
         return
     
     # Show all contacts first
-    show_all_contacts()
+    show_all_contacts(book)
     
     try:
         choice = int(input("\nEnter contact number to delete: "))
         
-        if choice >= 1 and choice <= len(contacts):
-            removed_contact = contacts.pop(choice - 1)
-            print(f"Deleted {removed_contact['name']} from contacts!")
+        removed_contact = book.delete(choice)
+        if removed_contact is not None:
+            print(f"Deleted {removed_contact[0]} from contacts!")
         else:
             print("Invalid contact number!")
             
@@ -87,6 +279,12 @@ def main():
     """Main program"""
     print("Welcome to Contact Book!")
     
+    try:
+        book = ContactBook()
+    except sqlite3.Error as e:
+        print(f"Could not open {DB_FILE}: {e}")
+        return
+    
     while True:
         show_menu()
         
@@ -94,13 +292,13 @@ def main():
             choice = int(input("Choose option (1-5): "))
             
             if choice == 1:
-                add_contact()
+                add_contact(book)
             elif choice == 2:
-                show_all_contacts()
+                show_all_contacts(book)
             elif choice == 3:
-                search_contact()
+                search_contact(book)
             elif choice == 4:
-                delete_contact()
+                delete_contact(book)
             elif choice == 5:
                 print("\nGoodbye!")
                 break
@@ -112,20 +310,23 @@ def main():
         
         # Wait before showing menu again
         input("\nPress Enter to continue...")
+    
+    book.close()
 
 # Start the program
-main()
+if __name__ == "__main__":
+    main()
 
 
 # LEARNING NOTES FOR BEGINNERS:
 # --------------------------------
-# 1. VARIABLES: contacts = [] creates a list
-# 2. DICTIONARIES: {"name": "John", "phone": "123"} stores key-value pairs
-# 3. LISTS: contacts.append() adds items, contacts.pop() removes items
+# 1. VARIABLES: book = ContactBook() creates our contact book
+# 2. TUPLES: ("John", "123") keeps a name and phone together
+# 3. DICTIONARIES AS INDEXES: by_name["john"] finds a contact instantly, without a loop over every contact
 # 4. FUNCTIONS: def function_name(): creates reusable code blocks
 # 5. LOOPS: for loop goes through each item, while loop repeats until condition
 # 6. CONDITIONALS: if/elif/else makes decisions
 # 7. INPUT/OUTPUT: input() gets user input, print() shows output
 # 8. TRY/EXCEPT: handles errors when user enters wrong input
-# 9. STRING METHODS: .lower() makes text lowercase for comparison
-# 10. LIST METHODS: len() gets length, range() creates number sequences
\ No newline at end of file
+# 9. STRING METHODS: .lower() and .casefold() make text lowercase for comparison
+# 10. DATABASES: sqlite3 saves contacts in a file, so they are still there next time
@@ -0,0 +1,74 @@
+import os
+import sys
+import time
+import random
+import tempfile
+import subprocess
+
+from ContactApp import ContactBook
+
+def timed(label, count, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<34} {elapsed:8.3f}s  {count / elapsed:14,.0f} ops/sec")
+    return result
+
+def make_contacts(count, seed=9):
+    rng = random.Random(seed)
+    first = ["John", "Mary", "Ann", "Ravi", "Chen", "Fatima", "Lucas", "Olga", "Kenji", "Zoe"]
+    for i in range(count):
+        yield f"{rng.choice(first)} Person{i}", f"+1 ({rng.randint(200, 999)}) {i // 10000:03d}-{i % 10000:04d}"
+
+def legacy_search(contacts, search_name):
+    # What search_contact() did: a case-insensitive scan of a list of dicts
+    for contact in contacts:
+        if contact["name"].lower() == search_name.lower():
+            return contact
+
+def run_startup():
+    # Runs in a child process so the timing doesn't include the benchmark's own data
+    start = time.perf_counter()
+    book = ContactBook("contacts.db")
+    print(time.perf_counter() - start)
+    book.db.close()
+
+def startup(label, count):
+    elapsed = float(subprocess.run([sys.executable, os.path.abspath(__file__), '_startup'],
+                                   capture_output=True, text=True, check=True).stdout)
+    print(f"{label:<34} {elapsed:8.3f}s  {count / elapsed:14,.0f} contacts/sec")
+
+def bench(count, lookups):
+    rng = random.Random(4)
+    pairs = list(make_contacts(count))
+    book = ContactBook("contacts.db")
+    timed(f"add_many ({count:,})", count, lambda: book.add_many(pairs))
+    timed("close (saves the index)", count, book.close)
+    startup("startup, saved index", count)
+    os.remove("contacts.db.index")
+    startup("startup, rebuilding the index", count)
+    book = ContactBook("contacts.db")
+
+    sample = rng.sample(pairs, lookups)
+    legacy = [{"name": name, "phone": phone} for name, phone in pairs]
+    scans = min(lookups, 50)
+    timed(f"linear name scan ({scans})", scans, lambda: [legacy_search(legacy, n.upper()) for n, _ in sample[:scans]])
+    timed(f"indexed name lookup ({lookups:,})", lookups, lambda: [book.find(n.upper()) for n, _ in sample])
+    timed(f"indexed phone lookup ({lookups:,})", lookups,
+          lambda: [book.find(p.replace(" ", "")) for _, p in sample])
+    ids = rng.sample(range(1, count + 1), min(lookups, 1_000))
+    timed(f"delete ({len(ids):,})", len(ids), lambda: [book.delete(i) for i in ids])
+    book.close()
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '_startup':
+        return run_startup()
+    
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    lookups = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        bench(count, lookups)
+
+if __name__ == "__main__":
+    main()